@@ -12,13 +12,20 @@ __author__ = "Surjith"
 from niftyterminal.api.market import get_market_status
 from niftyterminal.api.indices import (
     get_all_index_quote,
+    iter_all_index_quote,
     get_index_list,
     get_index_historical_data,
     get_index_stocks,
 )
 from niftyterminal.api.vix import get_vix_historical_data
 from niftyterminal.api.etf import get_all_etfs, get_etf_historical_data
-from niftyterminal.api.stocks import get_stocks_list, get_stock_quote, get_stock_financials
+from niftyterminal.api.stocks import (
+    get_stocks_list,
+    iter_stocks_list,
+    get_stocks_columns,
+    get_stock_quote,
+    get_stock_financials,
+)
 from niftyterminal.api.fundamentals import (
     get_stock_balance_sheet,
     get_stock_cash_flow,
@@ -37,6 +44,7 @@ __all__ = [
     # API functions
     "get_market_status",
     "get_all_index_quote",
+    "iter_all_index_quote",
     "get_index_list",
     "get_index_historical_data",
     "get_index_stocks",
@@ -44,6 +52,8 @@ __all__ = [
     "get_all_etfs",
     "get_etf_historical_data",
     "get_stocks_list",
+    "iter_stocks_list",
+    "get_stocks_columns",
     "get_stock_quote",
     "get_stock_financials",
     "get_stock_balance_sheet",
@@ -3,13 +3,20 @@
 from niftyterminal.api.market import get_market_status
 from niftyterminal.api.indices import (
     get_all_index_quote,
+    iter_all_index_quote,
     get_index_list,
     get_index_historical_data,
     get_index_stocks,
 )
 from niftyterminal.api.vix import get_vix_historical_data
 from niftyterminal.api.etf import get_all_etfs, get_etf_historical_data
-from niftyterminal.api.stocks import get_stocks_list, get_stock_quote, get_stock_financials
+from niftyterminal.api.stocks import (
+    get_stocks_list,
+    iter_stocks_list,
+    get_stocks_columns,
+    get_stock_quote,
+    get_stock_financials,
+)
 from niftyterminal.api.commodity import get_commodity_list, get_commodity_historical_data
 from niftyterminal.api.fundamentals import (
     get_stock_balance_sheet,
@@ -20,6 +27,7 @@ from niftyterminal.api.fundamentals import (
 __all__ = [
     "get_market_status",
     "get_all_index_quote",
+    "iter_all_index_quote",
     "get_index_list",
     "get_index_historical_data",
     "get_index_stocks",
@@ -27,6 +35,8 @@ __all__ = [
     "get_all_etfs",
     "get_etf_historical_data",
     "get_stocks_list",
+    "iter_stocks_list",
+    "get_stocks_columns",
     "get_stock_quote",
     "get_stock_financials",
     "get_stock_balance_sheet",
@@ -1,11 +1,104 @@
 """
-Shared utilities for XBRL parsing and fetching.
+Shared utilities for XBRL parsing, date parsing and fetching.
 
-Common helpers used across stocks.py and fundamentals.py to avoid duplication.
+Common helpers used across the api modules to avoid duplication.
 """
 
+import asyncio
 import random
 import httpx
+from datetime import date, datetime, timedelta
+
+
+_MONTHS = {
+    "JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
+    "JUL": 7, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DEC": 12,
+}
+
+
+def parse_dmy(date_str: str, sep: str = "-") -> str:
+    """
+    Convert a DD-Mon-YYYY date (e.g. "03-Jan-2025") to YYYY-MM-DD.
+
+    The common fixed-width shape is sliced by hand, which is several times
+    faster than strptime. Anything else (e.g. single-digit days, years before
+    1000, non-ASCII digits) falls back to strptime, so results always match
+    ``datetime.strptime(...).strftime("%Y-%m-%d")``. Returns "" if the string
+    is not a valid date.
+    """
+    if (
+        len(date_str) == 11
+        and date_str[2] == sep
+        and date_str[6] == sep
+        and date_str.isascii()
+    ):
+        day, month, year = date_str[:2], _MONTHS.get(date_str[3:6].upper()), date_str[7:]
+        # strftime("%Y") doesn't zero-pad years below 1000, so leave those to strptime
+        if month is not None and day.isdigit() and year.isdigit() and year[0] != "0":
+            try:
+                return date(int(year), month, int(day)).isoformat()
+            except ValueError:
+                return ""
+
+    try:
+        return datetime.strptime(date_str, f"%d{sep}%b{sep}%Y").strftime("%Y-%m-%d")
+    except ValueError:
+        return ""
+
+
+def _is_valid_time(time_str: str) -> bool:
+    """Check an "HH:MM" or "HH:MM:SS" string the way strptime's %H/%M/%S would."""
+    if time_str[2] != ":" or not (time_str[:2].isdigit() and time_str[3:5].isdigit()):
+        return False
+    if int(time_str[:2]) > 23 or int(time_str[3:5]) > 59:
+        return False
+    if len(time_str) == 5:
+        return True
+    return time_str[5] == ":" and time_str[6:].isdigit() and int(time_str[6:]) <= 59
+
+
+def parse_dmy_timestamp(timestamp_str: str) -> str:
+    """
+    Extract YYYY-MM-DD from a "DD-Mon-YYYY HH:MM" or "DD-Mon-YYYY HH:MM:SS" timestamp.
+
+    The two fixed-width shapes (17 and 20 chars) are dispatched on length and
+    parsed without strptime. Anything the fixed-width path can't parse (e.g.
+    "03-Jan-2025 1:2:3") falls back to trying each format with strptime.
+    Returns "" if the string is not a valid timestamp.
+    """
+    n = len(timestamp_str)
+    if (
+        (n == 17 or n == 20)
+        and timestamp_str[11] == " "
+        and timestamp_str.isascii()
+        and _is_valid_time(timestamp_str[12:])
+    ):
+        parsed = parse_dmy(timestamp_str[:11])
+        if parsed:
+            return parsed
+
+    for fmt in ("%d-%b-%Y %H:%M:%S", "%d-%b-%Y %H:%M"):
+        try:
+            return datetime.strptime(timestamp_str, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return ""
+
+
+def date_batches(start_dt: datetime, end_dt: datetime, max_days: int = 364) -> list:
+    """
+    Split a date range into windows of at most *max_days* for NSE's
+    historical APIs, returned as (from, to) pairs formatted DD-MM-YYYY.
+    """
+    batches = []
+    step = timedelta(days=max_days)
+    one_day = timedelta(days=1)
+    current_start = start_dt
+    while current_start < end_dt:
+        current_end = min(current_start + step, end_dt)
+        batches.append((current_start.strftime("%d-%m-%Y"), current_end.strftime("%d-%m-%Y")))
+        current_start = current_end + one_day
+    return batches
 
 
 def parse_number(value_str: str):
@@ -64,8 +157,6 @@ async def fetch_with_backoff(url: str, timeout: int = 15) -> str:
     Retries up to 3 times. On 429/503, waits 2^attempt * jitter seconds before
     retrying. On other errors, waits a short random delay.
     """
-    import asyncio
-
     for attempt in range(3):
         try:
             async with httpx.AsyncClient(
@@ -5,7 +5,11 @@ This module provides functions to fetch commodity-related data from NSE India.
 """
 
 from datetime import datetime
-from niftyterminal.core import afetch
+from functools import lru_cache
+from urllib.parse import quote
+
+from niftyterminal.core import afetch, AsyncNSESession
+from niftyterminal.api._utils import parse_dmy, date_batches
 
 
 # NSE Commodity API endpoints
@@ -13,6 +17,7 @@ COMMODITY_MASTER_URL = "https://www.nseindia.com/api/historical-spot-price-maste
 COMMODITY_HISTORY_URL = "https://www.nseindia.com/api/historical-spot-price"
 
 
+@lru_cache(maxsize=4096)
 def _parse_date(date_str: str) -> str:
     """
     Convert date from DD-Mon-YYYY format to YYYY-MM-DD.
@@ -20,11 +25,7 @@ def _parse_date(date_str: str) -> str:
     if not date_str:
         return ""
     
-    try:
-        dt = datetime.strptime(date_str.strip(), "%d-%b-%Y")
-        return dt.strftime("%Y-%m-%d")
-    except ValueError:
-        return ""
+    return parse_dmy(date_str.strip())
 
 
 def _format_date_for_api(date_str: str) -> str:
@@ -72,10 +73,6 @@ async def get_commodity_historical_data(symbol: str, start_date: str, end_date:
     """
     Get historical spot price data for a commodity asynchronously.
     """
-    import asyncio
-    from datetime import timedelta
-    from niftyterminal.core import AsyncNSESession
-    
     # Maximum days per API request (NSE limit)
     MAX_DAYS_PER_REQUEST = 364
     
@@ -97,27 +94,16 @@ async def get_commodity_historical_data(symbol: str, start_date: str, end_date:
     if start_dt > end_dt:
         return {}
     
-    # Generate date batches
-    date_batches = []
-    current_start = start_dt
-    
-    while current_start < end_dt:
-        current_end = min(current_start + timedelta(days=MAX_DAYS_PER_REQUEST), end_dt)
-        date_batches.append((current_start, current_end))
-        current_start = current_end + timedelta(days=1)
+    encoded_symbol = quote(symbol)
     
     # Fetch data for each batch
     all_records = {}
     
     async with AsyncNSESession() as nse:
-        tasks = []
-        for batch_start, batch_end in date_batches:
-            from_date = batch_start.strftime("%d-%m-%Y")
-            to_date = batch_end.strftime("%d-%m-%Y")
-            url = f"{COMMODITY_HISTORY_URL}?fromDate={from_date}&toDate={to_date}&symbol={symbol}"
-            tasks.append(nse.fetch(url))
-        
-        batch_results = await asyncio.gather(*tasks)
+        batch_results = await nse.fetch_many([
+            f"{COMMODITY_HISTORY_URL}?fromDate={from_date}&toDate={to_date}&symbol={encoded_symbol}"
+            for from_date, to_date in date_batches(start_dt, end_dt, MAX_DAYS_PER_REQUEST)
+        ])
         
         for batch_data in batch_results:
             if not batch_data:
@@ -149,7 +135,7 @@ async def get_commodity_historical_data(symbol: str, start_date: str, end_date:
     if not all_records:
         return {}
     
-    commodity_data = [all_records[d] for d in sorted(all_records.keys(), reverse=True)]
+    commodity_data = [all_records[d] for d in sorted(all_records, reverse=True)]
     
     return {
         "commodityData": commodity_data,
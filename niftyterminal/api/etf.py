@@ -5,7 +5,12 @@ This module provides functions to fetch ETF-related data from NSE India.
 """
 
 import re
-from niftyterminal.core import afetch
+from datetime import datetime
+from urllib.parse import quote
+from functools import lru_cache
+
+from niftyterminal.core import afetch, AsyncNSESession
+from niftyterminal.api._utils import parse_dmy, parse_dmy_timestamp, date_batches
 
 
 # NSE ETF API endpoint
@@ -418,20 +423,14 @@ def _parse_asset(assets: str) -> dict:
     }
 
 
+@lru_cache(maxsize=4096)
 def _parse_timestamp_to_date(timestamp_str: str) -> str:
     """
     Extract date from timestamp format DD-Mon-YYYY HH:MM:SS to YYYY-MM-DD.
     """
-    from datetime import datetime
     if not timestamp_str:
         return ""
-    for fmt in ["%d-%b-%Y %H:%M:%S", "%d-%b-%Y %H:%M"]:
-        try:
-            dt = datetime.strptime(timestamp_str, fmt)
-            return dt.strftime("%Y-%m-%d")
-        except ValueError:
-            continue
-    return ""
+    return parse_dmy_timestamp(timestamp_str)
 
 
 async def get_all_etfs() -> dict:
@@ -501,28 +500,20 @@ async def get_all_etfs() -> dict:
 ETF_HISTORY_URL = "https://www.nseindia.com/api/historicalOR/generateSecurityWiseHistoricalData"
 
 
+@lru_cache(maxsize=4096)
 def _parse_date_dmy(date_str: str) -> str:
     """
     Convert date from DD-Mon-YYYY format to YYYY-MM-DD.
     """
-    from datetime import datetime
     if not date_str:
         return ""
-    try:
-        dt = datetime.strptime(date_str.strip(), "%d-%b-%Y")
-        return dt.strftime("%Y-%m-%d")
-    except ValueError:
-        return ""
+    return parse_dmy(date_str.strip())
 
 
 async def get_etf_historical_data(symbol: str, start_date: str, end_date: str = None) -> dict:
     """
     Get historical OHLCV data for an ETF asynchronously.
     """
-    import asyncio
-    from datetime import datetime, timedelta
-    from niftyterminal.core import AsyncNSESession
-    
     # Maximum days per API request (NSE limit is ~365 days)
     MAX_DAYS_PER_REQUEST = 364
     
@@ -544,24 +535,15 @@ async def get_etf_historical_data(symbol: str, start_date: str, end_date: str =
     if start_dt > end_dt:
         return {}
     
-    # Generate date batches
-    date_batches = []
-    current_start = start_dt
-    while current_start < end_dt:
-        current_end = min(current_start + timedelta(days=MAX_DAYS_PER_REQUEST), end_dt)
-        date_batches.append((current_start, current_end))
-        current_start = current_end + timedelta(days=1)
+    encoded_symbol = quote(symbol)
     
     all_records = {}
     async with AsyncNSESession() as nse:
-        tasks = []
-        for batch_start, batch_end in date_batches:
-            from_date = batch_start.strftime("%d-%m-%Y")
-            to_date = batch_end.strftime("%d-%m-%Y")
-            url = f"{ETF_HISTORY_URL}?from={from_date}&to={to_date}&symbol={symbol}&type=priceVolumeDeliverable&series=ALL"
-            tasks.append(nse.fetch(url))
-        
-        batch_results = await asyncio.gather(*tasks)
+        batch_results = await nse.fetch_many([
+            f"{ETF_HISTORY_URL}?from={from_date}&to={to_date}"
+            f"&symbol={encoded_symbol}&type=priceVolumeDeliverable&series=ALL"
+            for from_date, to_date in date_batches(start_dt, end_dt, MAX_DAYS_PER_REQUEST)
+        ])
         
         for batch_data in batch_results:
             if not batch_data:
@@ -595,5 +577,5 @@ async def get_etf_historical_data(symbol: str, start_date: str, end_date: str =
         return {}
     
     return {
-        "etfData": [all_records[d] for d in sorted(all_records.keys(), reverse=True)],
+        "etfData": [all_records[d] for d in sorted(all_records, reverse=True)],
     }
@@ -12,6 +12,8 @@ import asyncio
 import random
 from urllib.parse import quote
 
+import httpx
+
 from niftyterminal.core import afetch
 from niftyterminal.api._utils import parse_number, fetch_with_backoff
 
@@ -31,9 +33,8 @@ async def _fetch_integrated_filing_list(symbol: str) -> list:
     Uses a direct client with quotes-page Referer since the shared session's
     option-chain Referer doesn't work for the GetQuoteApi endpoint.
     """
-    import httpx as _httpx
-
-    url = f"{_QUOTE_API}?functionName=getIntegratedFilingData&symbol={quote(symbol)}"
+    encoded_symbol = quote(symbol)
+    url = f"{_QUOTE_API}?functionName=getIntegratedFilingData&symbol={encoded_symbol}"
 
     headers = {
         "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -46,7 +47,7 @@ async def _fetch_integrated_filing_list(symbol: str) -> list:
         "Sec-Fetch-Dest": "empty",
         "Sec-Fetch-Mode": "cors",
         "Sec-Fetch-Site": "same-origin",
-        "Referer": f"https://www.nseindia.com/get-quotes/equity?symbol={quote(symbol)}",
+        "Referer": f"https://www.nseindia.com/get-quotes/equity?symbol={encoded_symbol}",
     }
     warmup_headers = {
         "User-Agent": headers["User-Agent"],
@@ -56,7 +57,7 @@ async def _fetch_integrated_filing_list(symbol: str) -> list:
     }
 
     try:
-        async with _httpx.AsyncClient(headers=headers, follow_redirects=True) as client:
+        async with httpx.AsyncClient(headers=headers, follow_redirects=True) as client:
             # Warmup — acquire cookies
             await client.get("https://www.nseindia.com", headers=warmup_headers, timeout=15)
             await asyncio.sleep(random.uniform(0.3, 0.6))
@@ -4,50 +4,49 @@ Indices API functions.
 This module provides functions to fetch index-related data from NSE India.
 """
 
-from niftyterminal.core import afetch
+import asyncio
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import AsyncIterator
+from urllib.parse import quote
+
+from niftyterminal.core import afetch, env_ttl, NiftyIndicesSession
+from niftyterminal.api._utils import parse_dmy, parse_dmy_timestamp
 
 
 # NSE All Indices API endpoint
 ALL_INDICES_URL = "https://www.nseindia.com/api/allIndices"
 
-# Sectoral indices that appear in derivatives list but should be marked as SECTORAL INDICES
-SECTORAL_OVERRIDE = {"NIFTY BANK", "NIFTY FIN SERVICE"}
+# Response cache TTLs in seconds (0 disables caching)
+ALL_INDICES_TTL = env_ttl("NIFTYTERMINAL_ALL_INDICES_TTL", 30)
+INDEX_LIST_TTL = env_ttl("NIFTYTERMINAL_INDEX_LIST_TTL", 3600)
+INDEX_STOCKS_TTL = env_ttl("NIFTYTERMINAL_INDEX_STOCKS_TTL", 300)
+
+# Built get_index_list() result, reused for INDEX_LIST_TTL seconds
+_INDEX_LIST_CACHE = {"ts": 0.0, "value": None}
 
 
+@lru_cache(maxsize=4096)
 def _parse_date_to_ymd(date_str: str) -> str:
     """
     Convert date from DD-Mon-YYYY format to YYYY-MM-DD.
     """
-    from datetime import datetime
-    
     if not date_str:
         return ""
     
-    try:
-        dt = datetime.strptime(date_str, "%d-%b-%Y")
-        return dt.strftime("%Y-%m-%d")
-    except ValueError:
-        return ""
+    return parse_dmy(date_str)
 
 
+@lru_cache(maxsize=4096)
 def _parse_timestamp_to_date(timestamp_str: str) -> str:
     """
     Extract date from timestamp format DD-Mon-YYYY HH:MM or HH:MM:SS to YYYY-MM-DD.
     """
-    from datetime import datetime
-    
     if not timestamp_str:
         return ""
     
-    # Try format with seconds first, then without
-    for fmt in ["%d-%b-%Y %H:%M:%S", "%d-%b-%Y %H:%M"]:
-        try:
-            dt = datetime.strptime(timestamp_str, fmt)
-            return dt.strftime("%Y-%m-%d")
-        except ValueError:
-            continue
-    
-    return ""
+    return parse_dmy_timestamp(timestamp_str)
 
 
 
@@ -56,11 +55,58 @@ def _calc_percent_change(current: float, past: float) -> float:
     Calculate percent change: ((current - past) / past) * 100
     Returns rounded to 2 decimal places, or 0 if past is 0.
     """
-    if not past or past == 0:
+    if not past:
         return 0
     return round(((current - past) / past) * 100, 2)
 
 
+def _build_index_quote(idx: dict, trade_date: str) -> dict:
+    """
+    Build one indexQuote row from a raw allIndices item.
+    """
+    index_name = idx.get("index", "")
+    ltp = idx.get("last", 0)
+
+    # Get historical values
+    one_week_ago_val = idx.get("oneWeekAgoVal", 0)
+    one_month_ago_val = idx.get("oneMonthAgoVal", 0)
+    one_year_ago_val = idx.get("oneYearAgoVal", 0)
+
+    # Calculate percent changes manually
+    one_week_pct = _calc_percent_change(ltp, one_week_ago_val)
+    one_month_pct = _calc_percent_change(ltp, one_month_ago_val)
+    one_year_pct = _calc_percent_change(ltp, one_year_ago_val)
+
+    # Parse historical dates to YYYY-MM-DD
+    one_week_ago_date = _parse_date_to_ymd(idx.get("oneWeekAgo", ""))
+    date_30d_ago = _parse_date_to_ymd(idx.get("date30dAgo", ""))
+    date_365d_ago = _parse_date_to_ymd(idx.get("date365dAgo", ""))
+
+    return {
+        "indexName": index_name,
+        "date": trade_date,
+        "open": idx.get("open", 0),
+        "high": idx.get("high", 0),
+        "low": idx.get("low", 0),
+        "ltp": ltp,
+        "prevClose": idx.get("previousClose", 0),
+        "change": idx.get("variation", 0),
+        "percentChange": idx.get("percentChange", 0),
+        "pe": idx.get("pe", ""),
+        "pb": idx.get("pb", ""),
+        "dy": idx.get("dy", ""),
+        "oneWeekAgoDate": one_week_ago_date,
+        "oneWeekAgoVal": one_week_ago_val,
+        "oneWeekAgoPercentChange": one_week_pct,
+        "30dAgoDate": date_30d_ago,
+        "30dAgoVal": one_month_ago_val,
+        "30dAgoPercentChange": one_month_pct,
+        "365dAgoDate": date_365d_ago,
+        "365dAgoVal": one_year_ago_val,
+        "365dAgoPercentChange": one_year_pct,
+    }
+
+
 async def get_all_index_quote() -> dict:
     """
     Get comprehensive quote data for all indices from NSE India.
@@ -102,7 +148,7 @@ async def get_all_index_quote() -> dict:
         >>> print(data['indexQuote'][0]['indexName'])
         'NIFTY 50'
     """
-    data = await afetch(ALL_INDICES_URL)
+    data = await afetch(ALL_INDICES_URL, cache_ttl=ALL_INDICES_TTL)
     
     if not data:
         return {}
@@ -112,54 +158,12 @@ async def get_all_index_quote() -> dict:
     if not raw_indices:
         return {}
     
-    index_list = []
     timestamp = data.get("timestamp", "")
     
-    for idx in raw_indices:
-        index_name = idx.get("index", "")
-        ltp = idx.get("last", 0)
-        
-        # Get historical values
-        one_week_ago_val = idx.get("oneWeekAgoVal", 0)
-        one_month_ago_val = idx.get("oneMonthAgoVal", 0)
-        one_year_ago_val = idx.get("oneYearAgoVal", 0)
-        
-        # Calculate percent changes manually
-        one_week_pct = _calc_percent_change(ltp, one_week_ago_val)
-        one_month_pct = _calc_percent_change(ltp, one_month_ago_val)
-        one_year_pct = _calc_percent_change(ltp, one_year_ago_val)
-        
-        # Parse historical dates to YYYY-MM-DD
-        one_week_ago_date = _parse_date_to_ymd(idx.get("oneWeekAgo", ""))
-        date_30d_ago = _parse_date_to_ymd(idx.get("date30dAgo", ""))
-        date_365d_ago = _parse_date_to_ymd(idx.get("date365dAgo", ""))
-        
-        # Get trading date from timestamp
-        trade_date = _parse_timestamp_to_date(timestamp)
-        
-        index_list.append({
-            "indexName": index_name,
-            "date": trade_date,
-            "open": idx.get("open", 0),
-            "high": idx.get("high", 0),
-            "low": idx.get("low", 0),
-            "ltp": ltp,
-            "prevClose": idx.get("previousClose", 0),
-            "change": idx.get("variation", 0),
-            "percentChange": idx.get("percentChange", 0),
-            "pe": idx.get("pe", ""),
-            "pb": idx.get("pb", ""),
-            "dy": idx.get("dy", ""),
-            "oneWeekAgoDate": one_week_ago_date,
-            "oneWeekAgoVal": one_week_ago_val,
-            "oneWeekAgoPercentChange": one_week_pct,
-            "30dAgoDate": date_30d_ago,
-            "30dAgoVal": one_month_ago_val,
-            "30dAgoPercentChange": one_month_pct,
-            "365dAgoDate": date_365d_ago,
-            "365dAgoVal": one_year_ago_val,
-            "365dAgoPercentChange": one_year_pct,
-        })
+    # Trading date is shared by every row, so parse it once
+    trade_date = _parse_timestamp_to_date(timestamp)
+    
+    index_list = [_build_index_quote(idx, trade_date) for idx in raw_indices]
     
     return {
         "timestamp": timestamp,
@@ -167,6 +171,29 @@ async def get_all_index_quote() -> dict:
     }
 
 
+async def iter_all_index_quote() -> AsyncIterator[dict]:
+    """
+    Yield index quote rows one at a time instead of building the full list.
+    
+    Each item has the same shape as an entry of ``get_all_index_quote()["indexQuote"]``.
+    Yields nothing if the API call fails.
+    
+    Example:
+        >>> async for row in iter_all_index_quote():
+        ...     if row["percentChange"] > 2:
+        ...         print(row["indexName"])
+    """
+    data = await afetch(ALL_INDICES_URL, cache_ttl=ALL_INDICES_TTL)
+    
+    if not data:
+        return
+    
+    trade_date = _parse_timestamp_to_date(data.get("timestamp", ""))
+    
+    for idx in data.get("data", []):
+        yield _build_index_quote(idx, trade_date)
+
+
 
 # NSE Equity Master API endpoint (for index list)
 INDEX_MASTER_URL = "https://www.nseindia.com/api/equity-master"
@@ -187,16 +214,27 @@ SUBTYPE_OVERRIDES = {
 }
 
 
-async def get_index_list() -> dict:
+async def get_index_list(force_refresh: bool = False) -> dict:
     """
     Get the master list of all indices from NSE India.
-    """
-    import asyncio
     
-    # Fetch both concurrently
+    The built list is kept in memory for INDEX_LIST_TTL seconds since the
+    index master changes rarely. Pass force_refresh=True to refetch.
+    """
+    cached = _INDEX_LIST_CACHE["value"]
+    if (
+        not force_refresh
+        and cached is not None
+        and time.monotonic() - _INDEX_LIST_CACHE["ts"] < INDEX_LIST_TTL
+    ):
+        # Fresh row dicts so callers can't modify the cached list
+        return {"indexList": [dict(row) for row in cached["indexList"]]}
+    
+    # Fetch both concurrently (bypassing the response cache on a forced refresh)
+    fetch_ttl = 0 if force_refresh else INDEX_LIST_TTL
     all_indices_data, data = await asyncio.gather(
-        afetch(ALL_INDICES_URL),
-        afetch(INDEX_MASTER_URL)
+        afetch(ALL_INDICES_URL, cache_ttl=fetch_ttl),
+        afetch(INDEX_MASTER_URL, cache_ttl=fetch_ttl)
     )
     
     # Build mapping: indexName -> indexSymbol
@@ -212,7 +250,7 @@ async def get_index_list() -> dict:
         return {}
     
     # Get the list of derivatives-eligible indices
-    derivatives_list = set(data.get("Indices Eligible in Derivatives", []))
+    derivatives_list = frozenset(data.get("Indices Eligible in Derivatives", []))
     
     index_list = []
     seen_indices = set()  # Track to avoid duplicates
@@ -255,11 +293,19 @@ async def get_index_list() -> dict:
                     "derivativesEligiblity": index_name in derivatives_list,
                 })
     
-    return {
+    result = {
         "indexList": index_list,
     }
+    
+    # Only keep a list built with real symbols; without allIndices every
+    # symbol falls back to the index name, so retry on the next call instead
+    if INDEX_LIST_TTL > 0 and all_indices_data:
+        _INDEX_LIST_CACHE.update(ts=time.monotonic(), value={"indexList": [dict(row) for row in index_list]})
+    
+    return result
 
 
+@lru_cache(maxsize=4096)
 def _normalize_nifty_date(date_str: str) -> str:
     """
     Normalize date from Nifty Indices API format to YYYY-MM-DD.
@@ -269,33 +315,14 @@ def _normalize_nifty_date(date_str: str) -> str:
     - DD-MMM-YYYY (e.g., "03-Jan-2025") -> "2025-01-03"
     - Already in YYYY-MM-DD -> returns as-is
     """
-    from datetime import datetime
-    
     if not date_str:
         return ""
     
-    # Try "DD MMM YYYY" format first (Nifty Indices API response format)
-    try:
-        dt = datetime.strptime(date_str.strip(), "%d %b %Y")
-        return dt.strftime("%Y-%m-%d")
-    except ValueError:
-        pass
-    
-    # Try "DD-MMM-YYYY" format 
-    try:
-        dt = datetime.strptime(date_str.strip().upper(), "%d-%b-%Y")
-        return dt.strftime("%Y-%m-%d")
-    except ValueError:
-        pass
-    
-    # Already in YYYY-MM-DD format
-    try:
-        datetime.strptime(date_str, "%Y-%m-%d")
-        return date_str
-    except ValueError:
-        pass
+    stripped = date_str.strip()
     
-    return date_str
+    # Try "DD MMM YYYY" format first (Nifty Indices API response format),
+    # then "DD-MMM-YYYY"; anything else (including YYYY-MM-DD) is returned as-is
+    return parse_dmy(stripped, sep=" ") or parse_dmy(stripped) or date_str
 
 
 async def get_index_historical_data(
@@ -306,10 +333,6 @@ async def get_index_historical_data(
     """
     Get historical OHLC, valuation, and total returns data for an index.
     """
-    import asyncio
-    from datetime import datetime
-    from niftyterminal.core import NiftyIndicesSession
-    
     # Parse dates (YYYY-MM-DD format)
     try:
         start_dt = datetime.strptime(start_date, "%Y-%m-%d")
@@ -390,8 +413,7 @@ async def get_index_historical_data(
     # Merge all data by date
     all_data = []
     
-    for date_key in sorted(history_data.keys(), reverse=True):
-        history = history_data[date_key]
+    for date_key, history in sorted(history_data.items(), reverse=True):
         pe_pb = pe_pb_div_data.get(date_key, {})
         total_ret = total_returns_data.get(date_key, {})
         
@@ -416,36 +438,37 @@ async def get_index_historical_data(
 # NSE Index Stocks API endpoint
 INDEX_STOCKS_URL = "https://www.nseindia.com/api/equity-stockIndices"
 
+# (key, default) pairs copied from each constituent's "meta" block
+_STOCK_META_FIELDS = (
+    ("symbol", ""),
+    ("companyName", ""),
+    ("isin", ""),
+)
+
 
+@lru_cache(maxsize=4096)
 def _parse_date(date_str: str) -> str:
     """
     Parse date from timestamp format to YYYY-MM-DD.
     
     Handles: "02-Jan-2026 16:00:00" -> "2026-01-02"
     """
-    from datetime import datetime
-    
     if not date_str:
         return ""
     
-    try:
-        # Parse "DD-Mon-YYYY HH:MM:SS" format
-        dt = datetime.strptime(date_str.split()[0], "%d-%b-%Y")
-        return dt.strftime("%Y-%m-%d")
-    except (ValueError, IndexError):
-        return ""
+    # Parse the "DD-Mon-YYYY" part of "DD-Mon-YYYY HH:MM:SS"
+    parts = date_str.split()
+    return parse_dmy(parts[0]) if parts else ""
 
 
 async def get_index_stocks(index_name: str) -> dict:
     """
     Get the list of stocks in an index from NSE India.
     """
-    from urllib.parse import quote
-    
     # Build URL with URL-encoded index name
     url = f"{INDEX_STOCKS_URL}?index={quote(index_name)}"
     
-    data = await afetch(url)
+    data = await afetch(url, cache_ttl=INDEX_STOCKS_TTL)
     
     if not data:
         return {}
@@ -470,14 +493,10 @@ async def get_index_stocks(index_name: str) -> dict:
         
         meta = item.get("meta", {})
         
-        if not meta:
+        if not meta or not meta.get("symbol"):
             continue
         
-        stock_list.append({
-            "symbol": meta.get("symbol", ""),
-            "companyName": meta.get("companyName", ""),
-            "isin": meta.get("isin", ""),
-        })
+        stock_list.append({key: meta.get(key, default) for key, default in _STOCK_META_FIELDS})
     
     return {
         "indexName": index_name_resp,
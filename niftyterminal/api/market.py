@@ -5,11 +5,14 @@ This module provides functions to fetch market status information from NSE India
 """
 
 from typing import Literal
-from niftyterminal.core import afetch
+from niftyterminal.core import afetch, env_ttl
 
 # NSE Market Status API endpoint
 MARKET_STATUS_URL = "https://www.nseindia.com/api/marketStatus"
 
+# Response cache TTL in seconds (0 disables caching)
+MARKET_STATUS_TTL = env_ttl("NIFTYTERMINAL_MARKET_STATUS_TTL", 30)
+
 # Valid market types
 MarketType = Literal["Capital Market", "Currency", "Commodity", "Debt", "currencyfuture"]
 
@@ -47,21 +50,22 @@ async def get_market_status(market: MarketType = "Capital Market") -> dict:
         >>> 
         >>> asyncio.run(main())
     """
-    data = await afetch(MARKET_STATUS_URL)
+    data = await afetch(MARKET_STATUS_URL, cache_ttl=MARKET_STATUS_TTL)
     
     if not data:
         return {}
     
-    # Look for specified market in the marketState array
+    # Index the marketState array by market name (reversed so the first entry wins)
     market_state = data.get("marketState", [])
+    by_market = {m.get("market"): m for m in reversed(market_state)}
     
-    for m in market_state:
-        if m.get("market") == market:
-            return {
-                "marketStatus": m.get("marketStatus", ""),
-                "marketStatusMessage": m.get("marketStatusMessage", ""),
-            }
+    m = by_market.get(market)
+    if not m:
+        # Specified market not found in response
+        return {}
     
-    # Specified market not found in response
-    return {}
+    return {
+        "marketStatus": m.get("marketStatus", ""),
+        "marketStatusMessage": m.get("marketStatusMessage", ""),
+    }
 
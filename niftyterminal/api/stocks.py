@@ -6,13 +6,18 @@ including stock lists, quotes, and quarterly/annual financial results
 parsed from NSE's Integrated Filing (iXBRL) pages.
 """
 
+import asyncio
 import csv
+import quopri
 import random
-import httpx
-from io import StringIO
-from niftyterminal.core import afetch
+import re
+from functools import lru_cache
+from typing import AsyncIterator, Iterator, NamedTuple, Optional
+from urllib.parse import quote
+from niftyterminal.core import afetch, afetch_raw_lines, env_ttl
 from niftyterminal.api._utils import (
     parse_number as _parse_number,
+    parse_dmy as _parse_dmy,
     has_valid_xbrl as _has_valid_xbrl,
     XBRL_HEADERS as _XBRL_HEADERS,
     fetch_with_backoff as _fetch_with_backoff,
@@ -22,94 +27,226 @@ from niftyterminal.api._utils import (
 # NSE Equity CSV URL
 EQUITY_CSV_URL = "https://nsearchives.nseindia.com/content/equities/EQUITY_L.csv"
 
+# Response cache TTL in seconds for the equity master CSV (0 disables caching)
+STOCKS_LIST_TTL = env_ttl("NIFTYTERMINAL_STOCKS_LIST_TTL", 3600)
+
 # NSE Quote API endpoints
 QUOTE_SYMBOL_DATA_URL = "https://www.nseindia.com/api/NextApi/apiClient/GetQuoteApi"
 
+# Boolean security flags copied from the symbol metadata response
+BOOL_KEYS = (
+    "isFNOSec", "isCASec", "isSLBSec", "isDebtSec", "isSuspended",
+    "isETFSec", "isDelisted", "isMunicipalBond", "isHybridSymbol",
+)
+
 
+@lru_cache(maxsize=4096)
 def _parse_listing_date(date_str: str) -> str:
     """
     Convert date from DD-Mon-YYYY format to YYYY-MM-DD.
     """
-    from datetime import datetime
-    
     if not date_str:
         return ""
     
-    # Handle datetime format with time
-    date_part = date_str.split()[0] if " " in date_str else date_str
-    
+    # Handle datetime format with time (keep only the date before the first space)
+    return _parse_dmy(date_str.strip().partition(" ")[0])
+
+
+class StockListing(NamedTuple):
+    """Compact stockList row returned by get_stocks_list(as_tuples=True)."""
+    symbol: str
+    companyName: str
+    series: str
+    isin: str
+
+
+# stockList keys, in the order _iter_stock_fields yields them
+STOCK_LIST_FIELDS = StockListing._fields
+
+
+def _iter_stock_fields(csv_lines) -> Iterator[tuple]:
+    """
+    Parse EQUITY_L.csv lines into (symbol, companyName, series, isin) tuples.
+    Yields nothing if the expected header columns are missing.
+    """
+    # Resolve column positions once from the header row
+    reader = csv.reader(csv_lines)
+    header = [col.strip() for col in next(reader, [])]  # Header has leading spaces (" SERIES")
+
     try:
-        dt = datetime.strptime(date_part.strip(), "%d-%b-%Y")
-        return dt.strftime("%Y-%m-%d")
+        i_symbol = header.index("SYMBOL")
+        i_name = header.index("NAME OF COMPANY")
+        i_series = header.index("SERIES")
+        i_isin = header.index("ISIN NUMBER")
     except ValueError:
-        return ""
+        return
 
+    min_len = max(i_symbol, i_name, i_series, i_isin) + 1
 
-async def _fetch_raw(url: str) -> str:
-    """Fetch raw content from URL asynchronously."""
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    }
-    
+    for row in reader:
+        if len(row) < min_len:
+            continue
+
+        symbol = row[i_symbol].strip()
+        if not symbol:
+            continue
+
+        yield (symbol, row[i_name].strip(), row[i_series].strip(), row[i_isin].strip())
+
+
+@lru_cache(maxsize=1)
+def _load_pyarrow_csv():
+    """Import pyarrow.csv on first use; None if the optional dependency is missing."""
     try:
-        async with httpx.AsyncClient(headers=headers, follow_redirects=True) as client:
-            response = await client.get(url, timeout=10)
-            response.raise_for_status()
-            return response.text
-    except Exception:
-        return ""
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        return None
+    return pa_csv
 
 
-async def get_stocks_list() -> dict:
+def _stock_columns_pyarrow(csv_lines) -> Optional[dict]:
     """
-    Get the complete list of all listed stocks on NSE asynchronously.
+    Column-wise parse of EQUITY_L.csv with pyarrow's C++ CSV reader.
+    
+    Produces the same columns as _iter_stock_fields. Returns None when
+    pyarrow is not installed or rejects the payload, so the caller can fall
+    back to the csv module.
     """
-    # Fetch the CSV content
-    csv_content = await _fetch_raw(EQUITY_CSV_URL)
+    pa_csv = _load_pyarrow_csv()
+    if pa_csv is None or not csv_lines:
+        return None
     
-    if not csv_content:
-        return {}
+    import pyarrow as pa
+    import pyarrow.compute as pc
     
-    stock_list = []
+    try:
+        raw_header = next(csv.reader(csv_lines[:1]))
+        table = pa_csv.read_csv(
+            pa.py_buffer("\n".join(csv_lines).encode("utf-8")),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pa.string() for name in raw_header},  # no type inference
+                strings_can_be_null=False,
+            ),
+        )
+    except (pa.ArrowException, StopIteration):
+        return None
     
-    # Parse CSV
-    reader = csv.DictReader(StringIO(csv_content))
+    by_name = {name.strip(): table.column(i) for i, name in enumerate(table.column_names)}
+    try:
+        picked = [
+            pc.utf8_trim_whitespace(by_name[name])
+            for name in ("SYMBOL", "NAME OF COMPANY", "SERIES", "ISIN NUMBER")
+        ]
+    except KeyError:
+        return {field: [] for field in STOCK_LIST_FIELDS}
     
-    for row in reader:
-        # Column names from CSV header
-        symbol = row.get("SYMBOL", "").strip()
-        company_name = row.get("NAME OF COMPANY", "").strip()
-        series = row.get(" SERIES", "").strip()  # Note: space before SERIES in header
-        isin = row.get(" ISIN NUMBER", "").strip()
-        
-        if not symbol:
-            continue
-        
-        stock_list.append({
+    keep = pc.not_equal(picked[0], "")
+    return {field: pc.filter(col, keep).to_pylist() for field, col in zip(STOCK_LIST_FIELDS, picked)}
+
+
+def _iter_stock_rows(csv_lines) -> Iterator[dict]:
+    """
+    Parse EQUITY_L.csv lines into stockList rows, one at a time.
+    """
+    for symbol, company_name, series, isin in _iter_stock_fields(csv_lines):
+        yield {
             "symbol": symbol,
             "companyName": company_name,
             "series": series,
             "isin": isin,
-        })
+        }
+
+
+async def _fetch_equity_csv_lines() -> tuple:
+    """
+    Download EQUITY_L.csv as a tuple of lines (empty on failure).
+    Shared by the stock list helpers so they hit the same response and disk cache.
+    """
+    return await afetch_raw_lines(EQUITY_CSV_URL, timeout=10, retries=0, cache_ttl=STOCKS_LIST_TTL, disk_cache=True)
+
+
+async def get_stocks_list(as_tuples: bool = False) -> dict:
+    """
+    Get the complete list of all listed stocks on NSE asynchronously.
+    
+    With as_tuples=True, stockList holds StockListing named tuples instead of
+    dicts: same fields (``stock.symbol``, ``stock.isin``, ...) at a fraction
+    of the memory. Use ``stock._asdict()`` where a dict is needed.
+    """
+    # Parse the CSV lines directly (no intermediate full-text string / StringIO copy)
+    csv_lines = await _fetch_equity_csv_lines()
+    
+    if not csv_lines:
+        return {}
+    
+    if as_tuples:
+        stock_list = list(map(StockListing._make, _iter_stock_fields(csv_lines)))
+    else:
+        stock_list = list(_iter_stock_rows(csv_lines))
     
     return {
         "stockList": stock_list,
     }
 
 
+async def get_stocks_columns() -> dict:
+    """
+    Get all listed stocks as columns (one list per field) instead of rows.
+    
+    Same data as get_stocks_list(), keyed by STOCK_LIST_FIELDS, with index i
+    of every list describing the same stock. No per-row dicts are built, and
+    the result can be passed straight to ``pandas.DataFrame(...)``. Parsing
+    uses pyarrow when it is installed (``pip install "niftyterminal[fast]"``).
+    A CSV without rows gives empty lists; {} means the download failed.
+    
+    Example:
+        >>> cols = await get_stocks_columns()
+        >>> sme = [s for s, series in zip(cols["symbol"], cols["series"]) if series == "SM"]
+    """
+    csv_lines = await _fetch_equity_csv_lines()
+    
+    if not csv_lines:
+        return {}
+    
+    columns = _stock_columns_pyarrow(csv_lines)
+    if columns is None:
+        # zip(*rows) is empty when there are no rows; keep one empty list per field
+        values = tuple(zip(*_iter_stock_fields(csv_lines))) or ((),) * len(STOCK_LIST_FIELDS)
+        columns = {field: list(column) for field, column in zip(STOCK_LIST_FIELDS, values)}
+    
+    return columns
+
+
+async def iter_stocks_list() -> AsyncIterator[dict]:
+    """
+    Yield listed stocks one at a time instead of building the full list.
+    
+    The CSV itself is still downloaded and held in memory first; only the
+    per-stock dicts are produced lazily. Each item has the same shape as an
+    entry of ``get_stocks_list()["stockList"]``. Yields nothing if the
+    download fails.
+    
+    Example:
+        >>> async for stock in iter_stocks_list():
+        ...     if stock["series"] == "SM":
+        ...         print(stock["symbol"])
+    """
+    csv_lines = await _fetch_equity_csv_lines()
+    
+    for row in _iter_stock_rows(csv_lines):
+        yield row
+
+
 async def get_stock_quote(symbol: str) -> dict:
     """
     Get quote and detailed information for a specific stock asynchronously.
     """
-    import asyncio
-    from urllib.parse import quote
-    
     # URLs
-    symbol_data_url = f"{QUOTE_SYMBOL_DATA_URL}?functionName=getSymbolData&marketType=N&series=EQ&symbol={quote(symbol)}"
-    meta_data_url = f"{QUOTE_SYMBOL_DATA_URL}?functionName=getMetaData&symbol={quote(symbol)}"
+    encoded_symbol = quote(symbol)
+    symbol_data_url = f"{QUOTE_SYMBOL_DATA_URL}?functionName=getSymbolData&marketType=N&series=EQ&symbol={encoded_symbol}"
+    meta_data_url = f"{QUOTE_SYMBOL_DATA_URL}?functionName=getMetaData&symbol={encoded_symbol}"
     
-    # Fetch both concurrently
+    # Fetch both concurrently on the event loop (wall time is max of the two, not the sum)
     symbol_response, meta_response = await asyncio.gather(
         afetch(symbol_data_url),
         afetch(meta_data_url)
@@ -129,14 +266,6 @@ async def get_stock_quote(symbol: str) -> dict:
     sec_info = data.get("secInfo", {})
     order_book = data.get("orderBook", {})
     
-    # Parse boolean flags
-    def parse_bool(val):
-        if isinstance(val, bool):
-            return val
-        if isinstance(val, str):
-            return val.lower() == "true"
-        return False
-    
     # Build result
     result = {
         "symbol": meta_data.get("symbol", symbol),
@@ -155,22 +284,15 @@ async def get_stock_quote(symbol: str) -> dict:
         "tradingSegment": sec_info.get("tradingSegment", ""),
     }
     
-    # Add flags
+    # Add flags (NSE normally sends real JSON booleans; "true"/"false" strings are tolerated)
     if meta_response:
-        result["isFNOSec"] = parse_bool(meta_response.get("isFNOSec", False))
-        result["isCASec"] = parse_bool(meta_response.get("isCASec", False))
-        result["isSLBSec"] = parse_bool(meta_response.get("isSLBSec", False))
-        result["isDebtSec"] = parse_bool(meta_response.get("isDebtSec", False))
-        result["isSuspended"] = parse_bool(meta_response.get("isSuspended", False))
-        result["isETFSec"] = parse_bool(meta_response.get("isETFSec", False))
-        result["isDelisted"] = parse_bool(meta_response.get("isDelisted", False))
-        result["isMunicipalBond"] = parse_bool(meta_response.get("isMunicipalBond", False))
-        result["isHybridSymbol"] = parse_bool(meta_response.get("isHybridSymbol", False))
+        for key in BOOL_KEYS:
+            val = meta_response.get(key, False)
+            result[key] = val if isinstance(val, bool) else (isinstance(val, str) and val.lower() == "true")
     else:
         # Default flags
-        for flag in ["isFNOSec", "isCASec", "isSLBSec", "isDebtSec", "isSuspended", 
-                    "isETFSec", "isDelisted", "isMunicipalBond", "isHybridSymbol"]:
-            result[flag] = False
+        for key in BOOL_KEYS:
+            result[key] = False
     
     # Price data
     result["open"] = meta_data.get("open", 0)
@@ -466,17 +588,15 @@ def _parse_legacy_html(html: str) -> dict:
     and optionally a Segment Reporting table.
     """
     from bs4 import BeautifulSoup
-    import re as _re
 
     # Handle MHTML: extract HTML portion if needed
     if html.strip().startswith("From:") or "MultipartBoundary" in html[:500]:
-        match = _re.search(
+        match = re.search(
             r'Content-Location:.*?\.html\r?\n\r?\n(.*?)(?:------MultipartBoundary|$)',
-            html, _re.DOTALL
+            html, re.DOTALL
         )
         if match:
             raw = match.group(1)
-            import quopri
             html = quopri.decodestring(raw.encode("utf-8", errors="replace")).decode("utf-8", errors="replace")
 
     soup = BeautifulSoup(html, "html.parser")
@@ -723,25 +843,24 @@ async def get_stock_financials(symbol: str, consolidated: bool = None, period: s
             ]
         }
     """
-    import asyncio
-    from urllib.parse import quote
-
     if period not in ("Quarterly", "Annual", "Both"):
         period = "Quarterly"
 
+    encoded_symbol = quote(symbol)
+
     # Fetch the filing list — issuer is derived from symbol via the API
     if period == "Both":
         # Fetch both quarterly and annual, merge results
         url_q = (
             f"{CORPORATES_FINANCIAL_URL}"
             f"?index=equities"
-            f"&symbol={quote(symbol)}"
+            f"&symbol={encoded_symbol}"
             f"&period=Quarterly"
         )
         url_a = (
             f"{CORPORATES_FINANCIAL_URL}"
             f"?index=equities"
-            f"&symbol={quote(symbol)}"
+            f"&symbol={encoded_symbol}"
             f"&period=Annual"
         )
         resp_q, resp_a = await asyncio.gather(
@@ -762,7 +881,7 @@ async def get_stock_financials(symbol: str, consolidated: bool = None, period: s
         url = (
             f"{CORPORATES_FINANCIAL_URL}"
             f"?index=equities"
-            f"&symbol={quote(symbol)}"
+            f"&symbol={encoded_symbol}"
             f"&period={period}"
         )
         response = await afetch(url, timeout=15)
@@ -4,7 +4,11 @@ VIX API functions.
 This module provides functions to fetch India VIX data from NSE India.
 """
 
-from niftyterminal.core import afetch
+from datetime import datetime
+from functools import lru_cache
+
+from niftyterminal.core import afetch, AsyncNSESession
+from niftyterminal.api._utils import parse_dmy, date_batches
 
 
 # NSE VIX Historical Data API endpoint
@@ -14,30 +18,17 @@ VIX_HISTORY_URL = "https://www.nseindia.com/api/historicalOR/vixhistory"
 MAX_DAYS_PER_REQUEST = 364
 
 
+@lru_cache(maxsize=4096)
 def _normalize_date(date_str: str) -> str:
     """
     Normalize date from DD-MMM-YYYY to YYYY-MM-DD format.
     """
-    from datetime import datetime
-    
     if not date_str:
         return ""
     
-    # Try DD-MMM-YYYY format (API response format)
-    try:
-        dt = datetime.strptime(date_str.upper(), "%d-%b-%Y")
-        return dt.strftime("%Y-%m-%d")
-    except ValueError:
-        pass
-    
-    # Already in YYYY-MM-DD format
-    try:
-        datetime.strptime(date_str, "%Y-%m-%d")
-        return date_str
-    except ValueError:
-        pass
-    
-    return date_str
+    # DD-MMM-YYYY is the API response format; anything else (including
+    # YYYY-MM-DD) is returned as-is
+    return parse_dmy(date_str) or date_str
 
 
 async def get_vix_historical_data(
@@ -47,10 +38,6 @@ async def get_vix_historical_data(
     """
     Get historical India VIX data from NSE India.
     """
-    import asyncio
-    from datetime import datetime, timedelta
-    from niftyterminal.core import AsyncNSESession
-    
     # Parse dates (YYYY-MM-DD format)
     try:
         start_dt = datetime.strptime(start_date, "%Y-%m-%d")
@@ -69,27 +56,14 @@ async def get_vix_historical_data(
     if start_dt > end_dt:
         return {}
     
-    # Generate date batches if range > MAX_DAYS_PER_REQUEST
-    date_batches = []
-    current_start = start_dt
-    
-    while current_start < end_dt:
-        current_end = min(current_start + timedelta(days=MAX_DAYS_PER_REQUEST), end_dt)
-        date_batches.append((current_start, current_end))
-        current_start = current_end + timedelta(days=1)
-    
-    # Fetch VIX data for each batch
-    vix_data = {}  # date -> {indexName, open, high, low, close}
+    # Fetch VIX data for each batch (split if range > MAX_DAYS_PER_REQUEST)
+    vix_data = {}  # date -> output row
     
     async with AsyncNSESession() as nse:
-        tasks = []
-        for batch_start, batch_end in date_batches:
-            from_date = batch_start.strftime("%d-%m-%Y")
-            to_date = batch_end.strftime("%d-%m-%Y")
-            url = f"{VIX_HISTORY_URL}?from={from_date}&to={to_date}"
-            tasks.append(nse.fetch(url))
-        
-        batch_results = await asyncio.gather(*tasks)
+        batch_results = await nse.fetch_many([
+            f"{VIX_HISTORY_URL}?from={from_date}&to={to_date}"
+            for from_date, to_date in date_batches(start_dt, end_dt, MAX_DAYS_PER_REQUEST)
+        ])
         
         for batch_data in batch_results:
             if batch_data and "data" in batch_data:
@@ -100,6 +74,7 @@ async def get_vix_historical_data(
                     if normalized_date:
                         vix_data[normalized_date] = {
                             "indexName": item.get("EOD_INDEX_NAME", ""),
+                            "date": normalized_date,
                             "open": item.get("EOD_OPEN_INDEX_VAL", 0),
                             "high": item.get("EOD_HIGH_INDEX_VAL", 0),
                             "low": item.get("EOD_LOW_INDEX_VAL", 0),
@@ -109,19 +84,8 @@ async def get_vix_historical_data(
     if not vix_data:
         return {}
     
-    # Build output sorted by date (newest first)
-    all_data = []
-    for date_key in sorted(vix_data.keys(), reverse=True):
-        data = vix_data[date_key]
-        all_data.append({
-            "indexName": data["indexName"],
-            "date": date_key,
-            "open": data["open"],
-            "high": data["high"],
-            "low": data["low"],
-            "close": data["close"],
-        })
-    
+    # Output sorted by date (newest first). Batches arrive in date order, so
+    # Timsort sees pre-sorted runs and this is close to linear.
     return {
-        "vixData": all_data,
+        "vixData": [vix_data[d] for d in sorted(vix_data, reverse=True)],
     }
@@ -3,9 +3,12 @@ from niftyterminal.core.session import (
     afetch, 
     fetch_raw, 
     afetch_raw, 
+    afetch_raw_lines,
     NSESession, 
     AsyncNSESession, 
-    NiftyIndicesSession
+    NiftyIndicesSession,
+    env_ttl,
+    clear_response_cache,
 )
 
 __all__ = [
@@ -13,7 +16,10 @@ __all__ = [
     "afetch", 
     "fetch_raw", 
     "afetch_raw", 
+    "afetch_raw_lines",
     "NSESession", 
     "AsyncNSESession", 
-    "NiftyIndicesSession"
+    "NiftyIndicesSession",
+    "env_ttl",
+    "clear_response_cache",
 ]
@@ -8,11 +8,25 @@ This module provides the core fetch function that handles:
 - Robust error handling for network and JSON failures
 """
 
+import os
 import time
+import json
+import hashlib
+import importlib.util
+import tempfile
 import asyncio
 import random
+import threading
+from contextlib import contextmanager
 import httpx
-from typing import Optional, Union, List, Any
+from collections import OrderedDict
+from typing import Optional, Union, List, Any, Iterator
+
+try:
+    # Optional: orjson parses bytes directly and is several times faster than json
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 # User-Agent rotation pool — realistic browser strings across Chrome/Firefox/Safari
 _USER_AGENTS = [
@@ -28,12 +42,18 @@ def _random_ua() -> str:
     return random.choice(_USER_AGENTS)
 
 
+# Only advertise what httpx can handle here: without brotli installed a "br"
+# body is passed through undecoded, and http2=True raises without h2.
+_HAS_BROTLI = any(importlib.util.find_spec(m) is not None for m in ("brotli", "brotlicffi"))
+ACCEPT_ENCODING = "gzip, deflate, br" if _HAS_BROTLI else "gzip, deflate"
+HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
 # Browser-like headers to mimic real browser requests
 HEADERS = {
     "User-Agent": _random_ua(),
     "Accept": "application/json, text/javascript, */*; q=0.01",
     "Accept-Language": "en-US,en;q=0.9",
-    "Accept-Encoding": "gzip, deflate, br",
+    "Accept-Encoding": ACCEPT_ENCODING,
     "Connection": "keep-alive",
     "X-Requested-With": "XMLHttpRequest",
     "Sec-Fetch-Dest": "empty",
@@ -62,6 +82,7 @@ class _AsyncRateLimiter:
     def __init__(self, max_rps: float = 3.0):
         self.min_interval = 1.0 / max_rps
         self._last: float = 0.0
+        self._paused_until: float = 0.0
         self._lock: Optional[asyncio.Lock] = None
 
     def _get_lock(self) -> asyncio.Lock:
@@ -69,8 +90,15 @@ class _AsyncRateLimiter:
             self._lock = asyncio.Lock()
         return self._lock
 
+    def backoff(self, delay: float):
+        """Hold back every caller for *delay* seconds (e.g. after NSE returns 429)."""
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
     async def wait(self):
         async with self._get_lock():
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
             loop = asyncio.get_event_loop()
             elapsed = loop.time() - self._last
             if elapsed < self.min_interval:
@@ -82,11 +110,55 @@ class _AsyncRateLimiter:
 _sync_limiter = _SyncRateLimiter(max_rps=3.0)
 _async_limiter = _AsyncRateLimiter(max_rps=3.0)
 
+# Throttling / transient gateway statuses: back off instead of re-warming the session
+BACKOFF_STATUSES = frozenset({429, 502, 503, 504})
+BACKOFF_BASE_DELAY = 0.5
+BACKOFF_MAX_DELAY = 10.0
+
+
+def _backoff_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Exponential backoff for *attempt*, honouring a numeric Retry-After header if present."""
+    if response is not None:
+        try:
+            # Clamp to [0, max]: a negative value would make time.sleep() raise (max() also drops NaN)
+            return max(0.0, min(float(response.headers.get("Retry-After", "")), BACKOFF_MAX_DELAY))
+        except ValueError:
+            pass
+    return min(BACKOFF_BASE_DELAY * (2 ** attempt), BACKOFF_MAX_DELAY) + random.uniform(0, 0.1)
+
+
+# Delay before retrying after a network error / bad response (not throttling)
+RETRY_BASE_DELAY = 0.1
+RETRY_MAX_DELAY = 2.0
+
+
+def _retry_delay(attempt: int) -> float:
+    """Short exponential delay with jitter: ~0.05-0.15s, ~0.1-0.3s, ... capped near RETRY_MAX_DELAY."""
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)) * (0.5 + random.random())
+
+
+def _is_permanent_error(status: int) -> bool:
+    """4xx statuses a retry can't fix (401/403 mean stale cookies, 429 is throttling)."""
+    return 400 <= status < 500 and status not in (401, 403, 429)
+
 # NSE URLs for session warmup
 NSE_BASE_URL = "https://www.nseindia.com"
 NSE_HOMEPAGE = NSE_BASE_URL
 NSE_OPTION_CHAIN = f"{NSE_BASE_URL}/option-chain"
 
+# Per-request header overrides, built once (httpx copies them, so sharing is safe)
+WARMUP_HEADERS = {
+    **HEADERS,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+    "Sec-Fetch-User": "?1",
+    "Cache-Control": "max-age=0",
+}
+API_REFERER_HEADERS = {"Referer": NSE_OPTION_CHAIN}
+
 # Warmup delay settings (reduced for speed)
 WARMUP_DELAY_MIN = 0.1
 WARMUP_DELAY_MAX = 0.2
@@ -98,29 +170,18 @@ def _create_session(is_async: bool = False) -> Union[httpx.Client, httpx.AsyncCl
     """
     headers = {**HEADERS, "User-Agent": _random_ua()}
     if is_async:
-        return httpx.AsyncClient(headers=headers, follow_redirects=True)
-    return httpx.Client(headers=headers, follow_redirects=True)
+        return httpx.AsyncClient(headers=headers, follow_redirects=True, http2=HTTP2_ENABLED)
+    return httpx.Client(headers=headers, follow_redirects=True, http2=HTTP2_ENABLED)
 
 
 async def _awarmup_session(session: httpx.AsyncClient, timeout: int = 10, fast: bool = False) -> bool:
     """
     Asynchronously warm up the session by visiting NSE homepage.
     """
-    warmup_headers = {
-        **HEADERS,
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-        "Upgrade-Insecure-Requests": "1",
-        "Sec-Fetch-Dest": "document",
-        "Sec-Fetch-Mode": "navigate",
-        "Sec-Fetch-Site": "none",
-        "Sec-Fetch-User": "?1",
-        "Cache-Control": "max-age=0",
-    }
-    
     try:
         response = await session.get(
             NSE_HOMEPAGE, 
-            headers=warmup_headers,
+            headers=WARMUP_HEADERS,
             timeout=timeout
         )
         response.raise_for_status()
@@ -139,21 +200,10 @@ def _warmup_session(session: httpx.Client, timeout: int = 10, fast: bool = False
     """
     Synchronously warm up the session by visiting NSE homepage.
     """
-    warmup_headers = {
-        **HEADERS,
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-        "Upgrade-Insecure-Requests": "1",
-        "Sec-Fetch-Dest": "document",
-        "Sec-Fetch-Mode": "navigate",
-        "Sec-Fetch-Site": "none",
-        "Sec-Fetch-User": "?1",
-        "Cache-Control": "max-age=0",
-    }
-    
     try:
         response = session.get(
             NSE_HOMEPAGE, 
-            headers=warmup_headers,
+            headers=WARMUP_HEADERS,
             timeout=timeout
         )
         response.raise_for_status()
@@ -177,7 +227,7 @@ async def _afetch_with_session(session: httpx.AsyncClient, url: str, timeout: in
             url, 
             timeout=timeout, 
             params=params,
-            headers={"Referer": NSE_OPTION_CHAIN}
+            headers=API_REFERER_HEADERS
         )
         response.raise_for_status()
         return response.json()
@@ -194,7 +244,7 @@ def _fetch_with_session(session: httpx.Client, url: str, timeout: int = 10, para
             url, 
             timeout=timeout, 
             params=params,
-            headers={"Referer": NSE_OPTION_CHAIN}
+            headers=API_REFERER_HEADERS
         )
         response.raise_for_status()
         return response.json()
@@ -244,9 +294,15 @@ class AsyncNSESession:
                     url,
                     timeout=self.timeout,
                     params=params,
-                    headers={"Referer": NSE_OPTION_CHAIN}
+                    headers=API_REFERER_HEADERS
                 )
 
+                if response.status_code in BACKOFF_STATUSES:
+                    # Throttled — pause all callers; re-warming would only add load
+                    if attempt < retries:
+                        _async_limiter.backoff(_backoff_delay(attempt, response))
+                    continue
+
                 if response.status_code == 401:
                     # Stale cookies — refresh and retry
                     if attempt < retries:
@@ -257,30 +313,45 @@ class AsyncNSESession:
                             await _awarmup_session(self.session, timeout=self.timeout, fast=True)
                     continue
 
+                if _is_permanent_error(response.status_code):
+                    return {}
+
                 if response.status_code == 200:
                     try:
                         return response.json()
                     except ValueError:
                         pass
-
-                if attempt < retries:
-                    if self.use_shared:
-                        await refresh_shared_client(self.timeout)
-                        self.session = await get_shared_client(self.timeout)
-                    else:
-                        await _awarmup_session(self.session, timeout=self.timeout, fast=True)
-                    await asyncio.sleep(random.uniform(0.2, 0.4))
             except Exception:
-                if attempt < retries:
-                    if self.use_shared:
-                        await refresh_shared_client(self.timeout)
-                        self.session = await get_shared_client(self.timeout)
-                    else:
-                        await _awarmup_session(self.session, timeout=self.timeout, fast=True)
-                    await asyncio.sleep(random.uniform(0.2, 0.4))
+                pass
+
+            # Other non-200 status, invalid JSON or network error → re-warm and retry
+            if attempt < retries:
+                if self.use_shared:
+                    await refresh_shared_client(self.timeout)
+                    self.session = await get_shared_client(self.timeout)
+                else:
+                    await _awarmup_session(self.session, timeout=self.timeout, fast=True)
+                await asyncio.sleep(_retry_delay(attempt))
 
         return {}
 
+    async def fetch_many(self, requests: list, concurrency: int = 8, retries: int = 1) -> list:
+        """
+        Fetch several endpoints concurrently on this session, in input order.
+
+        Each item is a URL or a (url, params) pair. At most *concurrency*
+        requests are in flight at once; the shared rate limiter still applies,
+        so this overlaps network latency rather than raising the request rate.
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(item):
+            url, params = (item, None) if isinstance(item, str) else item
+            async with sem:
+                return await self.fetch(url, params=params, retries=retries)
+
+        return await asyncio.gather(*(one(item) for item in requests))
+
 
 class NSESession:
     """
@@ -313,12 +384,75 @@ class NSESession:
                 return result
             
             if attempt < retries:
-                time.sleep(random.uniform(0.2, 0.4))
+                time.sleep(_retry_delay(attempt))
                 self._warmed_up = _warmup_session(self.session, timeout=self.timeout, fast=True)
         
         return {}
 
 
+def env_ttl(name: str, default: float) -> float:
+    """
+    Read a cache TTL (in seconds) from an environment variable, falling back to *default*.
+    A value of 0 disables caching for that endpoint.
+    """
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+class _ResponseCache:
+    """
+    Small in-process cache of successful responses, keyed by (url, params).
+
+    Entries remember when they were stored and each lookup passes its own
+    max age, so endpoints shared by several functions can use different TTLs.
+    Least recently used entries are evicted once *maxsize* is reached.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()  # fetch / fetch_raw may be called from several threads
+
+    def get(self, key: tuple, max_age: float) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > max_age:
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: tuple, value: Any):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_response_cache = _ResponseCache()
+
+# Cached afetch() calls currently on the wire, so concurrent callers share one request
+_inflight: dict = {}
+
+
+def _cache_key(url: str, params: Optional[dict] = None, kind: str = "json") -> tuple:
+    return (kind, url, tuple(sorted(params.items())) if params else ())
+
+
+def clear_response_cache():
+    """Drop all cached responses held by afetch / afetch_raw / afetch_raw_lines."""
+    _response_cache.clear()
+
+
 # Shared session instance
 _SHARED_ASYNC_CLIENT: Optional[httpx.AsyncClient] = None
 _LAST_WARMUP_TIME: float = 0
@@ -344,7 +478,8 @@ async def get_shared_client(timeout: int = 10) -> httpx.AsyncClient:
             _SHARED_ASYNC_CLIENT = httpx.AsyncClient(
                 headers={**HEADERS, "User-Agent": _random_ua()},
                 follow_redirects=True,
-                timeout=timeout
+                timeout=timeout,
+                http2=HTTP2_ENABLED
             )
             await _awarmup_session(_SHARED_ASYNC_CLIENT, timeout=timeout, fast=True)
             _LAST_WARMUP_TIME = now
@@ -364,11 +499,45 @@ async def refresh_shared_client(timeout: int = 10):
         _LAST_WARMUP_TIME = 0
     return await get_shared_client(timeout)
 
-async def afetch(url: str, timeout: int = 10, params: Optional[dict] = None, retries: int = 2) -> dict:
+async def afetch(
+    url: str,
+    timeout: int = 10,
+    params: Optional[dict] = None,
+    retries: int = 2,
+    cache_ttl: float = 0,
+) -> dict:
     """
     Asynchronously fetch data from an NSE API endpoint using a shared session.
     Automatically handles session refresh on failure and enforces rate limiting.
+
+    If *cache_ttl* is positive, a successful response younger than that many
+    seconds is served from the in-process cache instead of hitting NSE, and
+    concurrent calls for the same URL/params share a single request.
+    Cached responses are shared between callers and must not be mutated.
     """
+    if cache_ttl <= 0:
+        return await _afetch_uncached(url, timeout, params, retries)
+
+    key = _cache_key(url, params)
+    cached = _response_cache.get(key, cache_ttl)
+    if cached is not None:
+        return cached
+
+    # Join an identical request that is already in flight instead of sending another
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_afetch_uncached(url, timeout, params, retries))
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _inflight.pop(key, None) if _inflight.get(key) is t else None)
+
+    data = await asyncio.shield(task)
+    if data:
+        _response_cache.set(key, data)
+    return data
+
+
+async def _afetch_uncached(url: str, timeout: int, params: Optional[dict], retries: int) -> dict:
+    """Request loop behind afetch(): rate limiting, backoff and session refresh."""
     for attempt in range(retries + 1):
         try:
             await _async_limiter.wait()
@@ -377,101 +546,398 @@ async def afetch(url: str, timeout: int = 10, params: Optional[dict] = None, ret
                 url,
                 params=params,
                 timeout=timeout,
-                headers={"Referer": NSE_OPTION_CHAIN}
+                headers=API_REFERER_HEADERS
             )
 
+            if response.status_code in BACKOFF_STATUSES:
+                # Throttled — pause all callers; re-warming would only add load
+                if attempt < retries:
+                    _async_limiter.backoff(_backoff_delay(attempt, response))
+                continue
+
             if response.status_code == 401:
                 # Stale cookies — always refresh on 401
                 if attempt < retries:
                     await refresh_shared_client(timeout)
                 continue
 
+            if _is_permanent_error(response.status_code):
+                return {}
+
             # NSE sometimes returns 200 but with empty or invalid content if cookies are stale
             if response.status_code == 200:
                 try:
                     return response.json()
                 except ValueError:
-                    # Stale session or blocked
-                    pass
-
-            # Any other non-200 status → refresh and retry
-            if attempt < retries:
-                await refresh_shared_client(timeout)
-                await asyncio.sleep(random.uniform(0.3, 0.5))
+                    pass  # Stale session or blocked
+        except Exception:
+            pass
 
-        except (httpx.HTTPError, Exception):
-            if attempt < retries:
-                await refresh_shared_client(timeout)
-                await asyncio.sleep(random.uniform(0.3, 0.5))
+        # Other non-200 status, invalid JSON or network error → refresh and retry
+        if attempt < retries:
+            await refresh_shared_client(timeout)
+            await asyncio.sleep(_retry_delay(attempt))
 
     return {}
 
 
-def fetch(url: str, timeout: int = 10, params: Optional[dict] = None, retries: int = 2) -> dict:
+# Shared sync session instance (counterpart of the async one above)
+_SHARED_SYNC_CLIENT: Optional[httpx.Client] = None
+_LAST_SYNC_WARMUP_TIME: float = 0
+_SYNC_SESSION_LOCK = threading.Lock()
+
+# Requests in flight per sync client, and replaced clients waiting for theirs to finish
+_SYNC_CLIENT_USERS: dict = {}
+_RETIRED_SYNC_CLIENTS: set = set()
+
+def _retire_sync_client(client: httpx.Client):
+    """Close a replaced sync client now, or once its in-flight requests finish (lock held)."""
+    if _SYNC_CLIENT_USERS.get(client):
+        _RETIRED_SYNC_CLIENTS.add(client)
+    else:
+        client.close()
+
+def _current_sync_client(timeout: int) -> httpx.Client:
+    """Body of get_shared_sync_client(); the caller holds _SYNC_SESSION_LOCK."""
+    global _SHARED_SYNC_CLIENT, _LAST_SYNC_WARMUP_TIME
+    now = time.time()
+    if (
+        _SHARED_SYNC_CLIENT is None
+        or _SHARED_SYNC_CLIENT.is_closed
+        or (now - _LAST_SYNC_WARMUP_TIME) > 600
+    ):
+        if _SHARED_SYNC_CLIENT is not None:
+            _retire_sync_client(_SHARED_SYNC_CLIENT)
+        
+        _SHARED_SYNC_CLIENT = httpx.Client(
+            headers={**HEADERS, "User-Agent": _random_ua()},
+            follow_redirects=True,
+            timeout=timeout,
+            http2=HTTP2_ENABLED
+        )
+        _warmup_session(_SHARED_SYNC_CLIENT, timeout=timeout, fast=True)
+        _LAST_SYNC_WARMUP_TIME = now
+    
+    return _SHARED_SYNC_CLIENT
+
+def get_shared_sync_client(timeout: int = 10) -> httpx.Client:
     """
-    Synchronously fetch data from an NSE API endpoint with session warmup and rate limiting.
+    Get or create a shared httpx.Client with automatic warmup.
+    Refreshes session if older than 10 minutes.
     """
-    for attempt in range(retries + 1):
-        with _create_session(is_async=False) as session:
-            try:
-                if not _warmup_session(session, timeout=timeout, fast=True):
-                    if attempt < retries:
-                        time.sleep(random.uniform(0.3, 0.5))
-                        continue
+    with _SYNC_SESSION_LOCK:
+        return _current_sync_client(timeout)
+
+def refresh_shared_sync_client(timeout: int = 10) -> httpx.Client:
+    """Force a sync session refresh."""
+    global _SHARED_SYNC_CLIENT, _LAST_SYNC_WARMUP_TIME
+    with _SYNC_SESSION_LOCK:
+        if _SHARED_SYNC_CLIENT is not None:
+            _retire_sync_client(_SHARED_SYNC_CLIENT)
+        _SHARED_SYNC_CLIENT = None
+        _LAST_SYNC_WARMUP_TIME = 0
+    return get_shared_sync_client(timeout)
+
+@contextmanager
+def _use_shared_sync_client(timeout: int) -> Iterator[httpx.Client]:
+    """
+    Borrow the shared sync client for one request.
+    A refresh from another thread meanwhile leaves it open until the request is done.
+    """
+    with _SYNC_SESSION_LOCK:
+        client = _current_sync_client(timeout)
+        _SYNC_CLIENT_USERS[client] = _SYNC_CLIENT_USERS.get(client, 0) + 1
+    try:
+        yield client
+    finally:
+        with _SYNC_SESSION_LOCK:
+            _SYNC_CLIENT_USERS[client] -= 1
+            if not _SYNC_CLIENT_USERS[client]:
+                del _SYNC_CLIENT_USERS[client]
+                if client in _RETIRED_SYNC_CLIENTS:
+                    _RETIRED_SYNC_CLIENTS.discard(client)
+                    client.close()
+
+
+def fetch(
+    url: str,
+    timeout: int = 10,
+    params: Optional[dict] = None,
+    retries: int = 2,
+    cache_ttl: float = 0,
+) -> dict:
+    """
+    Synchronously fetch data from an NSE API endpoint using a shared session.
+    Warmup runs once per session; stale cookies (401) trigger a refresh.
+    *cache_ttl* works as in afetch() and shares the same cache.
+    """
+    key = _cache_key(url, params)
+    if cache_ttl > 0:
+        cached = _response_cache.get(key, cache_ttl)
+        if cached is not None:
+            return cached
 
-                _sync_limiter.wait()
+    for attempt in range(retries + 1):
+        try:
+            _sync_limiter.wait()
+            with _use_shared_sync_client(timeout) as session:
                 response = session.get(
                     url,
                     params=params,
                     timeout=timeout,
-                    headers={"Referer": NSE_OPTION_CHAIN}
+                    headers=API_REFERER_HEADERS
                 )
 
-                if response.status_code == 401:
-                    # Stale cookies — next iteration will create a fresh session
-                    if attempt < retries:
-                        time.sleep(random.uniform(0.3, 0.5))
-                    continue
+            if response.status_code in BACKOFF_STATUSES:
+                if attempt < retries:
+                    time.sleep(_backoff_delay(attempt, response))
+                continue
 
-                response.raise_for_status()
-                return response.json()
-            except (httpx.HTTPError, ValueError):
+            if response.status_code == 401:
+                # Stale cookies — re-warm a fresh session
                 if attempt < retries:
-                    time.sleep(random.uniform(0.3, 0.5))
+                    refresh_shared_sync_client(timeout)
+                continue
+
+            if _is_permanent_error(response.status_code):
+                return {}
+
+            response.raise_for_status()
+            data = response.json()
+            if cache_ttl > 0 and data:
+                _response_cache.set(key, data)
+            return data
+        except (httpx.HTTPError, ValueError):
+            if attempt < retries:
+                refresh_shared_sync_client(timeout)
+                time.sleep(_retry_delay(attempt))
     return {}
 
 
-async def afetch_raw(url: str, timeout: int = 10, retries: int = 2) -> str:
+# Headers for raw (non-JSON) downloads such as archive CSVs
+RAW_HEADERS = {**HEADERS, "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"}
+
+# Shared raw-download client instance (no cookie warmup needed) and the
+# event loop it belongs to; its pooled connections can't be used from another loop
+_SHARED_RAW_CLIENT: Optional[httpx.AsyncClient] = None
+_SHARED_RAW_CLIENT_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+async def get_shared_raw_client() -> httpx.AsyncClient:
     """
-    Asynchronously fetch raw text content from a URL.
+    Get or create a shared client for raw downloads.
+    Keeps connections to archive hosts alive across calls, and is rebuilt
+    when called from a different event loop (e.g. a second asyncio.run()).
     """
-    headers = {**HEADERS, "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"}
+    global _SHARED_RAW_CLIENT, _SHARED_RAW_CLIENT_LOOP
+    loop = asyncio.get_running_loop()
+    # No await between the check and the assignment, so no lock is needed
+    if (
+        _SHARED_RAW_CLIENT is None
+        or _SHARED_RAW_CLIENT.is_closed
+        or _SHARED_RAW_CLIENT_LOOP is not loop
+    ):
+        _SHARED_RAW_CLIENT = httpx.AsyncClient(
+            headers={**RAW_HEADERS, "User-Agent": _random_ua()},
+            follow_redirects=True,
+            http2=HTTP2_ENABLED
+        )
+        _SHARED_RAW_CLIENT_LOOP = loop
+    return _SHARED_RAW_CLIENT
+
+
+# Sync counterpart of the raw-download client
+_SHARED_SYNC_RAW_CLIENT: Optional[httpx.Client] = None
+_SYNC_RAW_CLIENT_LOCK = threading.Lock()
+
+def get_shared_sync_raw_client() -> httpx.Client:
+    """Get or create a shared sync client for raw downloads."""
+    global _SHARED_SYNC_RAW_CLIENT
+    with _SYNC_RAW_CLIENT_LOCK:
+        if _SHARED_SYNC_RAW_CLIENT is None or _SHARED_SYNC_RAW_CLIENT.is_closed:
+            _SHARED_SYNC_RAW_CLIENT = httpx.Client(
+                headers={**RAW_HEADERS, "User-Agent": _random_ua()},
+                follow_redirects=True,
+                http2=HTTP2_ENABLED
+            )
+        return _SHARED_SYNC_RAW_CLIENT
+
+
+# Archive hosts have no anti-bot checks, so retries use a short deterministic backoff
+RAW_RETRY_BASE_DELAY = 0.2
+
+def _should_retry_raw(exc: httpx.HTTPError) -> bool:
+    """Retry raw downloads only on timeouts / connection errors, 429 and 5xx."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+async def afetch_raw(url: str, timeout: int = 10, retries: int = 2, cache_ttl: float = 0) -> str:
+    """
+    Asynchronously fetch raw text content from a URL using a shared client.
+    Set *cache_ttl* to serve repeat requests from the in-process cache.
+    """
+    key = _cache_key(url, kind="raw")
+    if cache_ttl > 0:
+        cached = _response_cache.get(key, cache_ttl)
+        if cached is not None:
+            return cached
+
     for attempt in range(retries + 1):
-        async with httpx.AsyncClient(headers=headers, follow_redirects=True) as session:
-            try:
-                response = await session.get(url, timeout=timeout)
-                response.raise_for_status()
-                return response.text
-            except httpx.HTTPError:
-                if attempt < retries:
-                    await asyncio.sleep(random.uniform(0.3, 0.5))
+        try:
+            session = await get_shared_raw_client()
+            response = await session.get(url, timeout=timeout)
+            response.raise_for_status()
+            if cache_ttl > 0 and response.text:
+                _response_cache.set(key, response.text)
+            return response.text
+        except httpx.HTTPError as exc:
+            if attempt >= retries or not _should_retry_raw(exc):
+                break
+            await asyncio.sleep(RAW_RETRY_BASE_DELAY * (2 ** attempt))
+        except RuntimeError:
+            # e.g. a client whose event loop has gone away; documented to return "" on failure
+            break
     return ""
 
 
-def fetch_raw(url: str, timeout: int = 10, retries: int = 2) -> str:
+def _disk_cache_dir() -> str:
+    """
+    Directory for the on-disk download cache.
+    NIFTYTERMINAL_CACHE_DIR overrides it; setting it to "" disables the disk cache.
+    """
+    override = os.environ.get("NIFTYTERMINAL_CACHE_DIR")
+    if override is not None:
+        return override
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "niftyterminal")
+
+
+def _disk_cache_path(url: str) -> str:
+    cache_dir = _disk_cache_dir()
+    if not cache_dir:
+        return ""
+    return os.path.join(cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+
+def _read_disk_cache(path: str) -> Optional[dict]:
+    if not path:
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if isinstance(entry, dict) and entry.get("lines") else None
+
+
+def _write_disk_cache(path: str, entry: dict):
+    """Write *entry* atomically (temp file + os.replace) so concurrent writers never see a partial file."""
+    if not path:
+        return
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+async def afetch_raw_lines(
+    url: str,
+    timeout: int = 10,
+    retries: int = 2,
+    cache_ttl: float = 0,
+    disk_cache: bool = False,
+) -> tuple:
     """
-    Synchronously fetch raw text content from a URL.
+    Asynchronously stream a text resource (e.g. a CSV) and return its lines.
+
+    The body is decoded incrementally as it arrives instead of being buffered
+    into one string first. Returns an empty tuple on failure.
+
+    With *disk_cache*, the lines are also persisted under _disk_cache_dir()
+    together with the server's ETag / Last-Modified. An entry younger than
+    *cache_ttl* is used without a request; an older one is revalidated with a
+    conditional GET, and a 304 reply reuses it without downloading the body.
     """
-    headers = {**HEADERS, "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"}
+    key = _cache_key(url, kind="lines")
+    if cache_ttl > 0:
+        cached = _response_cache.get(key, cache_ttl)
+        if cached is not None:
+            return cached
+
+    disk_path = _disk_cache_path(url) if disk_cache else ""
+    entry = _read_disk_cache(disk_path)
+    headers = {}
+    if entry:
+        if time.time() - entry.get("fetched_at", 0) < cache_ttl:
+            lines = tuple(entry["lines"])
+            _response_cache.set(key, lines)
+            return lines
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
     for attempt in range(retries + 1):
-        with httpx.Client(headers=headers, follow_redirects=True) as session:
-            try:
-                response = session.get(url, timeout=timeout)
-                response.raise_for_status()
-                return response.text
-            except httpx.HTTPError:
-                if attempt < retries:
-                    time.sleep(random.uniform(0.3, 0.5))
+        try:
+            session = await get_shared_raw_client()
+            async with session.stream("GET", url, timeout=timeout, headers=headers) as response:
+                if entry and response.status_code == 304:
+                    lines = tuple(entry["lines"])
+                else:
+                    response.raise_for_status()
+                    lines = tuple([line async for line in response.aiter_lines()])
+                    entry = {
+                        "etag": response.headers.get("ETag", ""),
+                        "last_modified": response.headers.get("Last-Modified", ""),
+                        "lines": lines,
+                    }
+            if disk_path and lines:
+                entry["fetched_at"] = time.time()
+                _write_disk_cache(disk_path, entry)
+            if cache_ttl > 0 and lines:
+                _response_cache.set(key, lines)
+            return lines
+        except httpx.HTTPError as exc:
+            if attempt >= retries or not _should_retry_raw(exc):
+                break
+            await asyncio.sleep(RAW_RETRY_BASE_DELAY * (2 ** attempt))
+        except RuntimeError:
+            break
+    return ()
+
+
+def fetch_raw(url: str, timeout: int = 10, retries: int = 2, cache_ttl: float = 0) -> str:
+    """
+    Synchronously fetch raw text content from a URL using a shared client.
+    Set *cache_ttl* to serve repeat requests from the in-process cache.
+    """
+    key = _cache_key(url, kind="raw")
+    if cache_ttl > 0:
+        cached = _response_cache.get(key, cache_ttl)
+        if cached is not None:
+            return cached
+
+    for attempt in range(retries + 1):
+        try:
+            response = get_shared_sync_raw_client().get(url, timeout=timeout)
+            response.raise_for_status()
+            if cache_ttl > 0 and response.text:
+                _response_cache.set(key, response.text)
+            return response.text
+        except httpx.HTTPError as exc:
+            if attempt >= retries or not _should_retry_raw(exc):
+                break
+            time.sleep(RAW_RETRY_BASE_DELAY * (2 ** attempt))
     return ""
 
 
@@ -499,6 +965,9 @@ NIFTY_INDEX_PE_PB_DIV_URL = "https://niftyindices.com/Backpage.aspx/getpepbHisto
 NIFTY_INDEX_TOTAL_RETURNS_URL = "https://niftyindices.com/Backpage.aspx/getTotalReturnIndexString"
 
 
+# Compact JSON encoder for the cinfo payload (C-accelerated, no whitespace)
+_encode_cinfo = json.JSONEncoder(separators=(",", ":")).encode
+
 # Shared NiftyIndices session instance
 _SHARED_NIFTY_INDICES_CLIENT: Optional[httpx.AsyncClient] = None
 _NIFTY_INDICES_LOCK = asyncio.Lock()
@@ -510,7 +979,8 @@ async def get_shared_nifty_indices_client(timeout: int = 30) -> httpx.AsyncClien
         if _SHARED_NIFTY_INDICES_CLIENT is None:
             _SHARED_NIFTY_INDICES_CLIENT = httpx.AsyncClient(
                 headers=NIFTY_INDICES_HEADERS, 
-                timeout=timeout
+                timeout=timeout,
+                http2=HTTP2_ENABLED
             )
         return _SHARED_NIFTY_INDICES_CLIENT
 
@@ -526,7 +996,7 @@ class NiftyIndicesSession:
         self.use_shared = use_shared
 
     def __enter__(self):
-        self.session = httpx.Client(headers=NIFTY_INDICES_HEADERS, timeout=self.timeout)
+        self.session = httpx.Client(headers=NIFTY_INDICES_HEADERS, timeout=self.timeout, http2=HTTP2_ENABLED)
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -538,7 +1008,7 @@ class NiftyIndicesSession:
         if self.use_shared:
             self.asession = await get_shared_nifty_indices_client(self.timeout)
         else:
-            self.asession = httpx.AsyncClient(headers=NIFTY_INDICES_HEADERS, timeout=self.timeout)
+            self.asession = httpx.AsyncClient(headers=NIFTY_INDICES_HEADERS, timeout=self.timeout, http2=HTTP2_ENABLED)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -547,27 +1017,32 @@ class NiftyIndicesSession:
         return False
     
     def _build_cinfo(self, index_symbol: str, start_date: str, end_date: str) -> dict:
-        cinfo = f"{{'name':'{index_symbol}','startDate':'{start_date}','endDate':'{end_date}','indexName':'{index_symbol}'}}"
+        # Real JSON encoding, so quotes or backslashes in a name can't break the payload
+        cinfo = _encode_cinfo({
+            "name": index_symbol,
+            "startDate": start_date,
+            "endDate": end_date,
+            "indexName": index_symbol,
+        })
         return {"cinfo": cinfo}
     
     def _post(self, url: str, data: dict) -> list:
-        import json
         try:
             response = self.session.post(url, json=data)
             if response.status_code == 200:
-                result = response.json()
-                return json.loads(result.get("d", "[]"))
+                # Body is {"d": "<json string>"}: parse the raw bytes, then the payload
+                result = _json_loads(response.content)
+                return _json_loads(result.get("d") or "[]")
         except Exception:
             pass
         return []
 
     async def _apost(self, url: str, data: dict) -> list:
-        import json
         try:
             response = await self.asession.post(url, json=data)
             if response.status_code == 200:
-                result = response.json()
-                return json.loads(result.get("d", "[]"))
+                result = _json_loads(response.content)
+                return _json_loads(result.get("d") or "[]")
         except Exception:
             pass
         return []
@@ -0,0 +1,65 @@
+"""
+Tests for the in-memory get_index_list() cache.
+"""
+
+import asyncio
+
+import pytest
+
+from niftyterminal.api import indices
+
+MASTER = {"Broad Market Indices": ["NIFTY 50"]}
+ALL_INDICES = {"data": [{"index": "NIFTY 50", "indexSymbol": "NIFTY"}]}
+
+
+@pytest.fixture(autouse=True)
+def empty_index_cache(monkeypatch):
+    monkeypatch.setattr(indices, "_INDEX_LIST_CACHE", {"ts": 0.0, "value": None})
+
+
+def _fake_afetch(monkeypatch, responses):
+    calls = []
+
+    async def afetch(url, cache_ttl=0):
+        calls.append(url)
+        return responses[url]
+
+    monkeypatch.setattr(indices, "afetch", afetch)
+    return calls
+
+
+def test_index_list_not_cached_when_all_indices_fails(monkeypatch):
+    responses = {indices.ALL_INDICES_URL: {}, indices.INDEX_MASTER_URL: MASTER}
+    calls = _fake_afetch(monkeypatch, responses)
+
+    first = asyncio.run(indices.get_index_list())
+    assert first["indexList"][0]["indexSymbol"] == "NIFTY 50"
+
+    responses[indices.ALL_INDICES_URL] = ALL_INDICES
+    second = asyncio.run(indices.get_index_list())
+    assert second["indexList"][0]["indexSymbol"] == "NIFTY"
+    assert len(calls) == 4
+
+
+def test_index_list_cached_after_success(monkeypatch):
+    responses = {indices.ALL_INDICES_URL: ALL_INDICES, indices.INDEX_MASTER_URL: MASTER}
+    calls = _fake_afetch(monkeypatch, responses)
+
+    first = asyncio.run(indices.get_index_list())
+    assert asyncio.run(indices.get_index_list()) == first
+    assert len(calls) == 2
+
+
+def test_index_list_cache_unaffected_by_caller_changes(monkeypatch):
+    responses = {indices.ALL_INDICES_URL: ALL_INDICES, indices.INDEX_MASTER_URL: MASTER}
+    _fake_afetch(monkeypatch, responses)
+
+    first = asyncio.run(indices.get_index_list())
+    expected = {"indexList": [dict(row) for row in first["indexList"]]}
+    first["indexList"][0]["indexSymbol"] = "CHANGED"
+    first["indexList"].clear()
+
+    second = asyncio.run(indices.get_index_list())
+    assert second == expected
+    second["indexList"].clear()
+    assert asyncio.run(indices.get_index_list()) == expected
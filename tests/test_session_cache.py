@@ -0,0 +1,244 @@
+"""
+Tests for the shared clients, response caches and backoff in niftyterminal.core.session.
+
+Requests go to a local HTTP/1.1 server or an httpx.MockTransport, so these
+run without network access.
+"""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from niftyterminal.core import session
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive, which is what ties a pooled client to its loop
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        server.hits += 1
+        server.request_headers.append(dict(self.headers))
+        if server.etag and self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.send_header("ETag", server.etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = server.body
+        self.send_response(server.status)
+        if server.etag:
+            self.send_header("ETag", server.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.hits = 0
+    httpd.request_headers = []
+    httpd.status = 200
+    httpd.etag = None
+    httpd.body = b"SYMBOL,NAME\nABC,Abc Ltd\n"
+    httpd.url = f"http://127.0.0.1:{httpd.server_port}/data.csv"
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(monkeypatch, tmp_path):
+    monkeypatch.setenv("NIFTYTERMINAL_CACHE_DIR", str(tmp_path))
+    session.clear_response_cache()
+    monkeypatch.setattr(session, "_SHARED_RAW_CLIENT", None)
+    monkeypatch.setattr(session, "_SHARED_RAW_CLIENT_LOOP", None)
+    yield
+    session.clear_response_cache()
+
+
+def test_raw_fetch_works_across_event_loops(server):
+    assert asyncio.run(session.afetch_raw(server.url)) == server.body.decode()
+    assert asyncio.run(session.afetch_raw(server.url)) == server.body.decode()
+    assert asyncio.run(session.afetch_raw_lines(server.url)) == ("SYMBOL,NAME", "ABC,Abc Ltd")
+
+
+@pytest.fixture
+def no_warmup(monkeypatch):
+    monkeypatch.setattr(session, "_warmup_session", lambda *args, **kwargs: None)
+    monkeypatch.setattr(session, "_SHARED_SYNC_CLIENT", None)
+
+
+def test_sync_refresh_closes_idle_client(no_warmup):
+    old = session.get_shared_sync_client()
+    new = session.refresh_shared_sync_client()
+    assert new is not old
+    assert old.is_closed
+    assert not new.is_closed
+
+
+def test_sync_refresh_defers_close_until_request_done(no_warmup):
+    with session._use_shared_sync_client(10) as old:
+        new = session.refresh_shared_sync_client()
+        assert new is not old
+        assert not old.is_closed
+    assert old.is_closed
+    assert not session._RETIRED_SYNC_CLIENTS
+    assert not session._SYNC_CLIENT_USERS
+
+
+def test_sync_fetch_releases_client(server, no_warmup):
+    server.body = b'{"ok": 1}'
+    assert session.fetch(server.url) == {"ok": 1}
+    assert not session._SYNC_CLIENT_USERS
+
+
+def _lines(server, cache_ttl=60):
+    return asyncio.run(session.afetch_raw_lines(
+        server.url, retries=0, cache_ttl=cache_ttl, disk_cache=True
+    ))
+
+
+def test_disk_cache_fresh_entry_needs_no_request(server, tmp_path):
+    assert _lines(server) == ("SYMBOL,NAME", "ABC,Abc Ltd")
+    assert list(tmp_path.glob("*.json"))
+
+    session.clear_response_cache()
+    assert _lines(server) == ("SYMBOL,NAME", "ABC,Abc Ltd")
+    assert server.hits == 1
+
+
+def test_disk_cache_stale_entry_revalidated_with_304(server):
+    server.etag = '"v1"'
+    assert _lines(server) == ("SYMBOL,NAME", "ABC,Abc Ltd")
+
+    # A changed body proves the 304 path reuses the stored lines
+    server.body = b"SYMBOL,NAME\nXYZ,Xyz Ltd\n"
+    session.clear_response_cache()
+    assert _lines(server, cache_ttl=0) == ("SYMBOL,NAME", "ABC,Abc Ltd")
+    assert server.hits == 2
+    assert server.request_headers[-1].get("If-None-Match") == '"v1"'
+
+
+def test_disk_cache_skips_failed_downloads(server, tmp_path):
+    server.status = 500
+    assert _lines(server) == ()
+    assert not list(tmp_path.glob("*.json"))
+
+    server.status = 200
+    assert _lines(server) == ("SYMBOL,NAME", "ABC,Abc Ltd")
+    assert server.hits == 2
+
+
+@pytest.fixture
+def nse_transport(monkeypatch):
+    """Route afetch() through an in-memory transport; status and payload are adjustable."""
+    state = {"hits": 0, "status": 200, "json": {"data": [1, 2, 3]}, "queue": []}
+
+    async def handler(request):
+        state["hits"] += 1
+        await asyncio.sleep(0.05)  # long enough for concurrent callers to pile up
+        if state["queue"]:
+            # (status, headers) replies to send before falling back to "status"
+            status, headers = state["queue"].pop(0)
+            return httpx.Response(status, headers=headers, json={})
+        return httpx.Response(state["status"], json=state["json"])
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    async def get_shared_client(timeout=10):
+        return client
+
+    monkeypatch.setattr(session, "get_shared_client", get_shared_client)
+    monkeypatch.setattr(session, "_async_limiter", session._AsyncRateLimiter(max_rps=1000))
+    monkeypatch.setattr(session, "_inflight", {})
+    return state
+
+
+def test_concurrent_cached_afetch_shares_one_request(nse_transport):
+    async def main():
+        return await asyncio.gather(*(
+            session.afetch("https://example.test/api", retries=0, cache_ttl=60)
+            for _ in range(10)
+        ))
+
+    results = asyncio.run(main())
+    assert results == [{"data": [1, 2, 3]}] * 10
+    assert nse_transport["hits"] == 1
+    assert not session._inflight
+
+
+def test_cached_afetch_across_event_loops(nse_transport):
+    url = "https://example.test/api"
+    assert asyncio.run(session.afetch(url, retries=0, cache_ttl=60)) == {"data": [1, 2, 3]}
+    assert asyncio.run(session.afetch(url, retries=0, cache_ttl=60)) == {"data": [1, 2, 3]}
+    assert nse_transport["hits"] == 1
+
+    session.clear_response_cache()
+    assert asyncio.run(session.afetch(url, retries=0, cache_ttl=60)) == {"data": [1, 2, 3]}
+    assert nse_transport["hits"] == 2
+
+
+def test_failed_afetch_is_not_cached(nse_transport):
+    url = "https://example.test/api"
+    nse_transport["status"] = 404
+    assert asyncio.run(session.afetch(url, retries=0, cache_ttl=60)) == {}
+
+    nse_transport["status"] = 200
+    assert asyncio.run(session.afetch(url, retries=0, cache_ttl=60)) == {"data": [1, 2, 3]}
+    assert nse_transport["hits"] == 2
+
+
+def test_failed_raw_fetch_is_not_cached(server):
+    server.status = 500
+    assert asyncio.run(session.afetch_raw(server.url, retries=0, cache_ttl=60)) == ""
+
+    server.status = 200
+    assert asyncio.run(session.afetch_raw(server.url, retries=0, cache_ttl=60)) == server.body.decode()
+    assert asyncio.run(session.afetch_raw(server.url, retries=0, cache_ttl=60)) == server.body.decode()
+    assert server.hits == 2
+
+
+def test_afetch_backs_off_on_429_without_rewarming(nse_transport, monkeypatch):
+    async def no_refresh(timeout=10):
+        raise AssertionError("429 must not re-warm the session")
+
+    monkeypatch.setattr(session, "refresh_shared_client", no_refresh)
+    nse_transport["queue"] = [(429, {"Retry-After": "0"})]
+    assert asyncio.run(session.afetch("https://example.test/api", retries=1)) == {"data": [1, 2, 3]}
+    assert nse_transport["hits"] == 2
+
+
+def test_sync_fetch_negative_retry_after(monkeypatch):
+    replies = [httpx.Response(429, headers={"Retry-After": "-5"}), httpx.Response(200, json={"ok": 1})]
+    client = httpx.Client(transport=httpx.MockTransport(lambda request: replies.pop(0)))
+
+    def no_refresh(timeout=10):
+        raise AssertionError("429 must not re-warm the session")
+
+    monkeypatch.setattr(session, "_current_sync_client", lambda timeout: client)
+    monkeypatch.setattr(session, "refresh_shared_sync_client", no_refresh)
+    monkeypatch.setattr(session, "_sync_limiter", session._SyncRateLimiter(max_rps=1000))
+    assert session.fetch("https://example.test/api", retries=1) == {"ok": 1}
+    assert not replies
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("3", 3.0),
+    ("-5", 0.0),
+    ("nan", 0.0),
+    ("999", session.BACKOFF_MAX_DELAY),
+])
+def test_backoff_delay_clamps_retry_after(value, expected):
+    response = httpx.Response(429, headers={"Retry-After": value})
+    assert session._backoff_delay(0, response) == expected
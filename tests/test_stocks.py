@@ -0,0 +1,56 @@
+"""
+Tests for the EQUITY_L.csv stock list helpers.
+"""
+
+import asyncio
+
+import pytest
+
+from niftyterminal.api import stocks
+
+HEADER = "SYMBOL,NAME OF COMPANY, SERIES, DATE OF LISTING, PAID UP VALUE, MARKET LOT, ISIN NUMBER, FACE VALUE"
+ROW = "ABC,Abc Ltd,EQ,01-JAN-2000,10,1,INE000A01010,10"
+
+
+def _fake_csv(monkeypatch, lines):
+    async def fetch_lines():
+        return lines
+
+    monkeypatch.setattr(stocks, "_fetch_equity_csv_lines", fetch_lines)
+
+
+def test_stocks_list_rows(monkeypatch):
+    _fake_csv(monkeypatch, (HEADER, ROW))
+    result = asyncio.run(stocks.get_stocks_list())
+    assert result == {
+        "stockList": [
+            {"symbol": "ABC", "companyName": "Abc Ltd", "series": "EQ", "isin": "INE000A01010"}
+        ]
+    }
+    tuples = asyncio.run(stocks.get_stocks_list(as_tuples=True))
+    assert tuples["stockList"][0]._asdict() == result["stockList"][0]
+
+
+@pytest.mark.parametrize("lines, expected", [
+    ((HEADER,), {"stockList": []}),
+    ((), {}),
+])
+def test_stocks_list_empty_shapes(monkeypatch, lines, expected):
+    _fake_csv(monkeypatch, lines)
+    assert asyncio.run(stocks.get_stocks_list()) == expected
+
+
+def test_stocks_columns(monkeypatch):
+    _fake_csv(monkeypatch, (HEADER, ROW))
+    assert asyncio.run(stocks.get_stocks_columns()) == {
+        "symbol": ["ABC"], "companyName": ["Abc Ltd"], "series": ["EQ"], "isin": ["INE000A01010"],
+    }
+
+
+@pytest.mark.parametrize("lines, expected", [
+    ((HEADER,), {field: [] for field in stocks.STOCK_LIST_FIELDS}),
+    ((), {}),
+])
+def test_stocks_columns_empty_shapes(monkeypatch, lines, expected):
+    _fake_csv(monkeypatch, lines)
+    assert asyncio.run(stocks.get_stocks_columns()) == expected
@@ -0,0 +1,93 @@
+"""
+Tests for the shared date helpers in niftyterminal.api._utils.
+
+The fast paths must agree with the strptime expressions they replaced.
+"""
+
+from datetime import datetime
+
+import pytest
+
+from niftyterminal.api._utils import parse_dmy, parse_dmy_timestamp
+
+
+def _strptime_dmy(date_str, sep):
+    try:
+        return datetime.strptime(date_str, f"%d{sep}%b{sep}%Y").strftime("%Y-%m-%d")
+    except ValueError:
+        return ""
+
+
+def _strptime_timestamp(timestamp_str):
+    for fmt in ("%d-%b-%Y %H:%M:%S", "%d-%b-%Y %H:%M"):
+        try:
+            return datetime.strptime(timestamp_str, fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return ""
+
+
+DMY_CASES = [
+    "03-Jan-2025",   # normal
+    "31-Dec-1999",
+    "29-Feb-2024",   # leap day
+    "3-Jan-2025",    # single-digit day
+    " 3-Jan-2025",
+    "31-Feb-2025",   # invalid dates
+    "29-Feb-2025",
+    "00-Jan-2025",
+    "32-Jan-2025",
+    "03-Xyz-2025",   # bad months
+    "03-Sept-2025",
+    "03-jan-2025",   # mixed case
+    "03-JAN-2025",
+    "03-jAn-2025",
+    "03-Jan-0999",   # year before 1000
+    "０３-Jan-2025",  # non-ASCII digits
+    "03-Jan-２０２５",
+    "03-Jan-25",
+    "",
+]
+
+
+@pytest.mark.parametrize("sep", ["-", " "])
+@pytest.mark.parametrize("value", DMY_CASES)
+def test_parse_dmy_matches_strptime(value, sep):
+    date_str = value.replace("-", sep)
+    assert parse_dmy(date_str, sep=sep) == _strptime_dmy(date_str, sep)
+
+
+def test_parse_dmy_examples():
+    assert parse_dmy("03-Jan-2025") == "2025-01-03"
+    assert parse_dmy("03 Jan 2025", sep=" ") == "2025-01-03"
+    assert parse_dmy("31-Feb-2025") == ""
+
+
+TIMESTAMP_CASES = [
+    "03-Jan-2025 10:30",       # 17 chars, fixed width
+    "03-Jan-2025 10:30:45",    # 20 chars, fixed width
+    "03-Jan-2025 23:59:59",
+    "03-Jan-2025 1:2:3",       # 17 chars but not fixed width: strptime fallback
+    "03-Jan-2025 01:02:3",
+    "3-Jan-2025  10:30",       # 17 chars, single-digit day and double space
+    "3-Jan-2025 10:30",        # other widths
+    "3-Jan-2025 10:30:45",
+    "03-Jan-2025 24:00",       # invalid times
+    "03-Jan-2025 10:60",
+    "03-Jan-2025 10:30:60",
+    "03-Jan-2025 ١٠:30",       # non-ASCII digits in the time
+    "31-Feb-2025 10:30",       # invalid date
+    "03-jan-2025 10:30:45",
+    "03-Jan-2025",
+    "",
+]
+
+
+@pytest.mark.parametrize("value", TIMESTAMP_CASES)
+def test_parse_dmy_timestamp_matches_strptime(value):
+    assert parse_dmy_timestamp(value) == _strptime_timestamp(value)
+
+
+def test_parse_dmy_timestamp_fallback():
+    assert parse_dmy_timestamp("03-Jan-2025 1:2:3") == "2025-01-03"
+    assert parse_dmy_timestamp("03-Jan-2025 10:30:45") == "2025-01-03"